@@ -7,20 +7,69 @@ from utils.state_manager import reset_session_state
 API_BASE_URL = "http://localhost:8000/api/v1"
 
 
-# API로 토론 이력 조회
-def fetch_debate_history():
-    """API를 통해 토론 이력 가져오기"""
+# 한 번에 불러올 토론 이력 수
+HISTORY_PAGE_SIZE = 20
+
+# 완료되지 않은 토론 상태 표시 (서버에서 진행 중에 저장한 토론)
+STATUS_LABELS = {
+    "running": "진행 중",
+    "cancelled": "중단됨",
+    "failed": "실패",
+}
+
+
+# API로 토론 이력 조회 (커서 기반 페이지 단위)
+def fetch_debate_history(cursor=None, limit=HISTORY_PAGE_SIZE):
+    """API를 통해 토론 이력 한 페이지와 다음 페이지 커서 가져오기"""
     try:
-        response = requests.get(f"{API_BASE_URL}/debates/")
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = requests.get(f"{API_BASE_URL}/debates/", params=params)
         if response.status_code == 200:
-            debates = response.json()
-            # API 응답 형식에 맞게 데이터 변환 (id, topic, date, rounds)
-            return [
-                (debate["id"], debate["topic"], debate["created_at"], debate["rounds"])
-                for debate in debates
+            page = response.json()
+            # API 응답 형식에 맞게 데이터 변환 (id, topic, date, rounds, preview, status)
+            debates = [
+                (
+                    debate["id"],
+                    debate["topic"],
+                    debate["created_at"],
+                    debate["rounds"],
+                    debate.get("preview"),
+                    debate.get("status"),
+                )
+                for debate in page["items"]
             ]
+            return debates, page.get("next_cursor")
         else:
             st.error(f"토론 이력 조회 실패: {response.status_code}")
+            return [], None
+    except Exception as e:
+        st.error(f"API 호출 오류: {str(e)}")
+        return [], None
+
+
+# API로 토론 검색 (주제/발언 내용, 관련도 순)
+def search_debate_history(query, limit=HISTORY_PAGE_SIZE):
+    """API를 통해 검색어와 일치하는 토론 목록 가져오기 (미리보기 대신 일치 부분 발췌)"""
+    try:
+        response = requests.get(
+            f"{API_BASE_URL}/debates/search", params={"q": query, "limit": limit}
+        )
+        if response.status_code == 200:
+            return [
+                (
+                    debate["id"],
+                    debate["topic"],
+                    debate["created_at"],
+                    debate["rounds"],
+                    debate.get("snippet") or debate.get("preview"),
+                    debate.get("status"),
+                )
+                for debate in response.json()
+            ]
+        else:
+            st.error(f"토론 검색 실패: {response.status_code}")
             return []
     except Exception as e:
         st.error(f"API 호출 오류: {str(e)}")
@@ -75,17 +124,20 @@ def delete_debate_by_id(debate_id):
 def delete_all_debates():
     """API를 통해 모든 토론 삭제"""
     try:
-        # 모든 토론 목록 조회
-        debates = fetch_debate_history()
-        if not debates:
-            return True
-
-        # 각 토론 항목 삭제
+        # 모든 토론 목록을 페이지 단위로 조회하며 삭제
         success = True
-        for debate_id, _, _, _ in debates:
-            response = requests.delete(f"{API_BASE_URL}/debates/{debate_id}")
-            if response.status_code != 200:
-                success = False
+        cursor = None
+        while True:
+            debates, cursor = fetch_debate_history(cursor, limit=100)
+
+            # 각 토론 항목 삭제
+            for debate_id, *_ in debates:
+                response = requests.delete(f"{API_BASE_URL}/debates/{debate_id}")
+                if response.status_code != 200:
+                    success = False
+
+            if not cursor:
+                break
 
         if success:
             st.success("모든 토론이 삭제되었습니다.")
@@ -95,53 +147,55 @@ def delete_all_debates():
         return False
 
 
-# API로 토론 저장
-def save_debate(topic, rounds, messages, docs=None):
-    """API를 통해 토론 결과를 데이터베이스에 저장"""
-    try:
-        # API 요청 데이터 준비
-        debate_data = {
-            "topic": topic,
-            "rounds": rounds,
-            "messages": (
-                json.dumps(messages) if not isinstance(messages, str) else messages
-            ),
-            "docs": (
-                json.dumps(docs)
-                if docs and not isinstance(docs, str)
-                else (docs or "{}")
-            ),
-        }
-
-        response = requests.post(f"{API_BASE_URL}/debates/", json=debate_data)
-
-        if response.status_code == 200 or response.status_code == 201:
-            st.success("토론이 성공적으로 저장되었습니다.")
-            return response.json().get("id")  # 저장된 토론 ID 반환
-        else:
-            st.error(f"토론 저장 실패: {response.status_code} - {response.text}")
-            return None
-    except Exception as e:
-        st.error(f"API 호출 오류: {str(e)}")
-        return None
+# 토론 이력 초기화 (첫 페이지부터 다시 로드)
+def reset_history():
+    st.session_state.history_items = []
+    st.session_state.history_cursor = None
+    st.session_state.history_loaded = False
+
+
+# 다음 페이지를 불러와 기존 목록 뒤에 추가
+def load_more_history():
+    debates, cursor = fetch_debate_history(st.session_state.history_cursor)
+    st.session_state.history_items.extend(debates)
+    st.session_state.history_cursor = cursor
+    st.session_state.history_loaded = True
 
 
 # 토론 이력 UI 렌더링
 def render_history_ui():
 
+    if "history_items" not in st.session_state:
+        reset_history()
+
     col1, col2 = st.columns([1, 1])
 
     with col1:
         if st.button("이력 새로고침", use_container_width=True):
+            reset_history()
             st.rerun()
 
     with col2:
         if st.button("전체 이력 삭제", type="primary", use_container_width=True):
             if delete_all_debates():
+                reset_history()
                 st.rerun()
 
-    # 토론 이력 로드
-    debate_history = fetch_debate_history()
+    # 주제/발언 내용 검색
+    query = st.text_input("토론 검색", placeholder="주제 또는 발언 내용", key="history_query")
+    if query.strip():
+        results = search_debate_history(query.strip())
+        if not results:
+            st.info("검색 결과가 없습니다.")
+        else:
+            render_history_list(results, paginated=False)
+        return
+
+    # 토론 이력 첫 페이지 로드
+    if not st.session_state.history_loaded:
+        load_more_history()
+
+    debate_history = st.session_state.history_items
 
     if not debate_history:
         st.info("저장된 토론 이력이 없습니다.")
@@ -150,17 +204,24 @@ def render_history_ui():
 
 
 # 토론 이력 목록 렌더링
-def render_history_list(debate_history):
-    for id, topic, date, rounds in debate_history:
+def render_history_list(debate_history, paginated=True):
+    for id, topic, date, rounds, preview, status in debate_history:
         with st.container(border=True):
 
             # 토론 주제
             st.write(f"***{topic}***")
 
+            # 첫 발언 미리보기
+            if preview:
+                st.caption(preview)
+
             col1, col2, col3 = st.columns([3, 1, 1])
             # 토론 정보
             with col1:
-                st.caption(f"날짜: {date} | 라운드: {rounds}")
+                info = f"날짜: {date} | 라운드: {rounds}"
+                if status in STATUS_LABELS:
+                    info += f" | {STATUS_LABELS[status]}"
+                st.caption(info)
 
             # 보기 버튼
             with col2:
@@ -180,4 +241,14 @@ def render_history_list(debate_history):
                 if st.button("삭제", key=f"del_{id}", use_container_width=True):
                     if delete_debate_by_id(id):
                         reset_session_state()
+                        reset_history()
                         st.rerun()
+
+    # 무한 스크롤 - 목록 끝에서 다음 페이지 불러오기
+    if paginated and st.session_state.history_cursor:
+        st.button(
+            "더 보기",
+            key="history_load_more",
+            on_click=load_more_history,
+            use_container_width=True,
+        )
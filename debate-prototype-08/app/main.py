@@ -1,12 +1,16 @@
 import json
+import hashlib
 import requests
 import streamlit as st
-from components.history import save_debate
+from components.history import reset_history
 from components.sidebar import render_sidebar
 from utils.state_manager import init_session_state, reset_session_state
 
 API_BASE_URL = "http://localhost:8000/api/v1"
 
+# 변경분만 전송하는 스트림 프로토콜 (message/docs/summary 이벤트)
+STREAM_PROTOCOL_VERSION = 2
+
 
 class AgentType:
     PRO = "PRO_AGENT"
@@ -14,62 +18,148 @@ class AgentType:
     JUDGE = "JUDGE_AGENT"
 
 
+def get_avatar(role):
+    if role == AgentType.PRO:
+        return "🙆🏻‍♀️"
+    elif role == AgentType.CON:
+        return "🙅🏻‍♂"
+    elif role == AgentType.JUDGE:
+        return "👩🏻‍⚖️"
+
+
+# 생성 중인 토큰을 실시간 메시지 영역에 표시
+def render_token(data):
+    role = data.get("role")
+    current_round = data.get("current_round")
+
+    live = st.session_state.get("live_message")
+
+    # 새 발언이 시작되면 메시지 영역 생성
+    if not live or live["role"] != role or live["round"] != current_round:
+        if role == AgentType.PRO:
+            st.subheader(f"{current_round}/{st.session_state.max_rounds} 라운드")
+
+        with st.chat_message(role, avatar=get_avatar(role)):
+            placeholder = st.empty()
+
+        live = {
+            "role": role,
+            "round": current_round,
+            "text": "",
+            "placeholder": placeholder,
+        }
+        st.session_state.live_message = live
+
+    live["text"] += data.get("content", "")
+    live["placeholder"].markdown(live["text"] + "▌")
+
+
+# 완료된 발언 표시
+def render_message(role, current_round, content):
+    live = st.session_state.get("live_message")
+
+    # 토큰으로 표시 중이던 메시지는 최종 응답으로 교체
+    if live and live["role"] == role and live["round"] == current_round:
+        live["placeholder"].markdown(content)
+        st.session_state.live_message = None
+        return
+
+    if role == AgentType.PRO:
+        st.subheader(f"{current_round}/{st.session_state.max_rounds} 라운드")
+
+    with st.chat_message(role, avatar=get_avatar(role)):
+        st.markdown(content)
+
+
+# 토론 완료 처리
+def finish_debate(summary):
+    messages = st.session_state.messages
+
+    # 수신한 메시지로 재구성한 토론 내용 검증
+    payload = json.dumps(messages, ensure_ascii=False, sort_keys=True)
+    if hashlib.sha256(payload.encode("utf-8")).hexdigest() != summary.get(
+        "content_hash"
+    ):
+        st.warning("수신한 토론 내용이 서버와 일치하지 않습니다.")
+
+    st.session_state.app_mode = "results"
+    st.session_state.viewing_history = False
+
+    # 토론은 서버에서 진행 중에 저장됨 - 새 토론이 목록 맨 앞에 보이도록 다시 로드
+    reset_history()
+
+    # 참고 자료 표시
+    if st.session_state.docs:
+        render_source_materials()
+
+    if st.button("새 토론 시작"):
+        reset_session_state()
+        st.session_state.app_mode = "input"
+        st.rerun()
+
+
 def process_event_data(event_data):
 
+    event_type = event_data.get("type")
+    data = event_data.get("data", {})
+
     # 이벤트 종료
-    if event_data.get("type") == "end":
+    if event_type == "end":
         return True
 
-    # 새로운 메세지
-    if event_data.get("type") == "update":
-        # state 추출
-        data = event_data.get("data", {})
-
-        role = data.get("role")
-        response = data["response"]
-        topic = data["topic"]
-        messages = data["messages"]
-        current_round = data["current_round"]
-        max_rounds = data["max_rounds"]
-        docs = data.get("docs", {})
+    # 대기열 순번 - 실행이 시작되면 안내 문구 제거
+    queue_notice = st.session_state.get("queue_notice")
+    if event_type == "queued":
+        if queue_notice is None:
+            queue_notice = st.session_state.queue_notice = st.empty()
+        queue_notice.info(f"토론 대기 중입니다... (대기 순번: {data['position']})")
+        return False
+    elif queue_notice is not None:
+        queue_notice.empty()
+        st.session_state.queue_notice = None
+
+    # 토론 실행 실패 (마지막 이벤트) - 그때까지의 발언은 서버에 저장되어 있음
+    if event_type == "error":
+        st.session_state.live_message = None
+        st.error("토론 진행 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
+        # 다음 화면은 입력 화면으로, 중단된 토론은 이력에서 확인
+        st.session_state.app_mode = "input"
+        reset_history()
+        return True
 
-        if role == AgentType.PRO:
-            st.subheader(f"{current_round}/{max_rounds} 라운드")
+    # 서버에 저장된 토론 ID (실행 시작 시 한 번)
+    if event_type == "debate":
+        st.session_state.loaded_debate_id = data["debate_id"]
 
-        message = response
+    # 생성 중인 토큰
+    elif event_type == "token":
+        render_token(data)
 
-        if role == AgentType.PRO:
-            avatar = "🙆🏻‍♀️"
-        elif role == AgentType.CON:
-            avatar = "🙅🏻‍♂"
-        elif role == AgentType.JUDGE:
-            avatar = "👩🏻‍⚖️"
+    # 역할별 참고 자료 (역할당 한 번)
+    elif event_type == "docs":
+        st.session_state.docs[data["role"]] = data.get("docs", [])
 
-        with st.chat_message(role, avatar=avatar):
-            st.markdown(message)
-
-        if role == AgentType.JUDGE:
-            st.session_state.app_mode = "results"
-            st.session_state.viewing_history = False
-            st.session_state.messages = messages
-            st.session_state.docs = docs
-
-            # 완료된 토론 정보 저장
-            save_debate(
-                topic,
-                max_rounds,
-                messages,
-                docs,
+    # 새로운 메세지
+    elif event_type == "message":
+        message = {
+            "role": data["role"],
+            "content": data["content"],
+            "current_round": data["current_round"],
+        }
+        st.session_state.messages.append(message)
+        render_message(message["role"], message["current_round"], message["content"])
+
+        # 발언별 토큰 사용량
+        usage = data.get("usage")
+        if usage:
+            st.caption(
+                f"토큰: 프롬프트 {usage.get('prompt_tokens', 0):,} / "
+                f"응답 {usage.get('completion_tokens', 0):,}"
             )
 
-            # 참고 자료 표시
-            if st.session_state.docs:
-                render_source_materials()
-
-            if st.button("새 토론 시작"):
-                reset_session_state()
-                st.session_state.app_mode = "input"
-                st.rerun()
+    # 토론 요약 (마지막 이벤트)
+    elif event_type == "summary":
+        finish_debate(data)
 
     return False
 
@@ -82,7 +172,7 @@ def process_streaming_response(response):
         # 'data: ' 접두사 제거
         line = chunk.decode("utf-8")
 
-        # line의 형태는 'data: {"type": "update", "data": {}}'
+        # line의 형태는 'data: {"type": "message", "data": {}}'
         if not line.startswith("data: "):
             continue
 
@@ -109,12 +199,19 @@ def start_debate():
 
     enabled_rag = st.session_state.get("ui_enable_rag", False)
 
+    # 스트림으로 수신한 메시지/참고 자료를 누적할 상태 초기화
+    st.session_state.messages = []
+    st.session_state.docs = {}
+    st.session_state.live_message = None
+    st.session_state.queue_notice = None
+
     with st.spinner("토론이 진행 중입니다... 완료까지 잠시 기다려주세요."):
         # API 요청 데이터
         data = {
             "topic": topic,
             "max_rounds": max_rounds,
             "enable_rag": enabled_rag,
+            "protocol_version": STREAM_PROTOCOL_VERSION,
         }
 
         try:
@@ -123,7 +220,11 @@ def start_debate():
                 f"{API_BASE_URL}/workflow/debate/stream",
                 json=data,
                 stream=True,
-                headers={"Content-Type": "application/json"},
+                headers={
+                    "Content-Type": "application/json",
+                    # 서버의 클라이언트별 동시 토론 할당량 식별용
+                    "X-Client-Id": st.session_state.client_id,
+                },
             )
 
             # stream=True로 설정하여 스트리밍 응답 처리
@@ -1,3 +1,4 @@
+import uuid
 import streamlit as st
 
 
@@ -6,6 +7,10 @@ def init_session_state():
     if "app_mode" not in st.session_state:
         reset_session_state()
 
+    # 브라우저 세션별 클라이언트 ID
+    if "client_id" not in st.session_state:
+        st.session_state.client_id = str(uuid.uuid4())
+
 
 def reset_session_state():
     st.session_state.app_mode = False
@@ -13,6 +18,7 @@ def reset_session_state():
     st.session_state.viewing_history = False
     st.session_state.loaded_debate_id = None
     st.session_state.docs = {}
+    st.session_state.live_message = None
 
 
 def set_debate_to_state(topic, messages, debate_id, docs):
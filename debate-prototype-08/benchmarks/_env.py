@@ -0,0 +1,37 @@
+"""
+벤치마크 공통 환경 설정
+
+server/ 패키지를 임포트할 수 있도록 경로를 추가하고,
+Settings 필수 값에 더미 값을 채워 외부 서비스 없이 실행할 수 있게 합니다.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# launch.json 과 동일하게 프로젝트 루트와 server/ 를 모두 경로에 추가
+for path in (os.path.join(ROOT, "server"), ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+for key in (
+    "AOAI_API_KEY",
+    "AOAI_DEPLOY_GPT4O",
+    "AOAI_EMBEDDING_DEPLOYMENT",
+    "AOAI_API_VERSION",
+    "LANGFUSE_PUBLIC_KEY",
+    "LANGFUSE_SECRET_KEY",
+):
+    os.environ.setdefault(key, "stub")
+os.environ.setdefault("AOAI_ENDPOINT", "http://127.0.0.1:9")
+os.environ.setdefault("LANGFUSE_HOST", "http://127.0.0.1:9")
+
+
+def percentile(values, p):
+    """정렬된 값에서 p 백분위수(0~100)를 반환합니다."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+    return ordered[index]
@@ -0,0 +1,69 @@
+"""
+스트림 이벤트 페이로드 크기 벤치마크
+
+1~10 라운드 토론에서 그래프가 내보내는 업데이트 순서를 그대로 재현해
+프로토콜 v1(전체 상태)과 v2(변경분) 인코더가 전송하는 바이트 수를 비교합니다.
+token 이벤트는 두 프로토콜에서 동일하므로 제외합니다.
+
+실행 (debate-prototype-08 디렉토리에서):
+    python benchmarks/event_payload_size.py
+"""
+
+import _env  # noqa: F401  (경로/환경 설정)
+
+from workflow.events import DeltaEncoder, FullStateEncoder, format_event
+from workflow.state import AgentType
+
+MESSAGE = "토론 발언 예시 문장입니다. " * 20  # 약 300자
+DOC = "검색된 참고 자료 본문 예시입니다. " * 25  # 약 500자
+
+
+def simulate(encoder, max_rounds: int) -> int:
+    """한 토론 동안 인코더가 생성하는 SSE 바이트 수"""
+    debate_state = {
+        "topic": "인공지능은 인간의 일자리를 대체할 수 있습니다.",
+        "messages": [],
+        "current_round": 1,
+        "max_rounds": max_rounds,
+        "prev_node": "START",
+        "docs": {},
+    }
+    total = 0
+
+    def emit(role, node, update):
+        nonlocal total
+        for event_type, data in encoder.encode_update(role, node, update):
+            total += len(format_event(event_type, data).encode("utf-8"))
+
+    def turn(role):
+        debate_state["docs"][role] = [DOC, DOC]
+        emit(role, "retrieve_context", {"debate_state": debate_state})
+        debate_state["messages"].append(
+            {
+                "role": role,
+                "content": MESSAGE,
+                "current_round": debate_state["current_round"],
+            }
+        )
+        emit(role, "update_state", {"debate_state": debate_state, "response": MESSAGE})
+
+    for round in range(1, max_rounds + 1):
+        debate_state["current_round"] = round
+        turn(AgentType.PRO)
+        turn(AgentType.CON)
+
+    debate_state["current_round"] = max_rounds + 1
+    turn(AgentType.JUDGE)
+
+    for event_type, data in encoder.encode_end():
+        total += len(format_event(event_type, data).encode("utf-8"))
+
+    return total
+
+
+if __name__ == "__main__":
+    print(f"{'rounds':>6} {'v1 bytes':>12} {'v2 bytes':>12} {'ratio':>7}")
+    for rounds in range(1, 11):
+        full = simulate(FullStateEncoder(), rounds)
+        delta = simulate(DeltaEncoder(), rounds)
+        print(f"{rounds:>6} {full:>12,} {delta:>12,} {full / delta:>6.1f}x")
@@ -0,0 +1,37 @@
+"""
+요청별 토론 그래프 준비 비용 벤치마크
+
+매 요청마다 그래프를 생성/컴파일하는 경우(create_debate_graph)와
+설정별로 캐시된 그래프를 사용하는 경우(get_debate_graph)의 평균 소요 시간을 비교합니다.
+
+실행 (debate-prototype-08 디렉토리에서):
+    python benchmarks/graph_setup.py --iterations 200
+"""
+
+import argparse
+import time
+
+import _env  # noqa: F401  (경로/환경 설정)
+
+from workflow.graph import create_debate_graph, get_debate_graph
+
+
+def measure(build, iterations: int) -> float:
+    """그래프 준비 1회당 평균 소요 시간(ms)"""
+    start = time.perf_counter()
+    for i in range(iterations):
+        build(i % 2 == 0)  # RAG on/off 번갈아 요청
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    uncached = measure(create_debate_graph, args.iterations)
+    cached = measure(get_debate_graph, args.iterations)
+
+    print(f"iterations={args.iterations}")
+    print(f"create_debate_graph (per request) : {uncached:8.3f} ms")
+    print(f"get_debate_graph    (cached)      : {cached:8.3f} ms")
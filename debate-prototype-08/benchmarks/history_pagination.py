@@ -0,0 +1,125 @@
+"""
+토론 목록 페이지네이션 벤치마크 (OFFSET vs 키셋)
+
+임시 SQLite DB에 토론 N건(기본 100만 건)을 만든 뒤, 목록의 여러 깊이에서
+OFFSET 방식과 (created_at, id) 키셋 커서 방식(read_debates)의 한 페이지 조회 시간을 비교합니다.
+
+실행 (debate-prototype-08 디렉토리에서):
+    python benchmarks/history_pagination.py --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import _env  # noqa: F401  (경로/환경 설정)
+
+DB_DIR = tempfile.mkdtemp(prefix="history-bench-")
+DB_FILE = os.path.join(DB_DIR, "history.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{DB_FILE}"
+
+from db.database import Base, SessionLocal, engine  # noqa: E402
+from db.migrations import run_migrations  # noqa: E402
+from routers.history import encode_cursor, read_debates  # noqa: E402
+from server.db import models  # noqa: E402,F401  (테이블 등록)
+from server.db.models import Debate as DebateModel  # noqa: E402
+
+MESSAGES = json.dumps(
+    [{"role": "PRO_AGENT", "content": "벤치마크용 발언 " * 20, "current_round": 1}],
+    ensure_ascii=False,
+)
+
+
+def populate(rows: int, batch: int = 50_000):
+    """토론 rows 건을 직접 삽입 (1초에 여러 건이 생성되도록 created_at 을 겹치게 배치)"""
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+
+    start = datetime(2024, 1, 1)
+    conn = sqlite3.connect(DB_FILE)
+    for offset in range(0, rows, batch):
+        conn.executemany(
+            "INSERT INTO debates (topic, rounds, messages, docs, created_at, preview, message_count) "
+            "VALUES (?, 1, ?, '{}', ?, ?, 1)",
+            (
+                (
+                    f"토론 주제 {i}",
+                    MESSAGES,
+                    (start + timedelta(seconds=i // 3)).strftime("%Y-%m-%d %H:%M:%S"),
+                    "벤치마크용 발언",
+                )
+                for i in range(offset, min(offset + batch, rows))
+            ),
+        )
+        conn.commit()
+    conn.close()
+
+
+def offset_page(db, skip: int, limit: int):
+    return (
+        db.query(
+            DebateModel.id,
+            DebateModel.topic,
+            DebateModel.rounds,
+            DebateModel.created_at,
+            DebateModel.preview,
+            DebateModel.message_count,
+        )
+        .order_by(DebateModel.created_at.desc(), DebateModel.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+def cursor_at(skip: int) -> str:
+    """앞의 skip 건을 읽은 상태의 커서 (skip 번째 항목의 키)"""
+    conn = sqlite3.connect(DB_FILE)
+    created_at, debate_id = conn.execute(
+        "SELECT created_at, id FROM debates ORDER BY created_at DESC, id DESC "
+        "LIMIT 1 OFFSET ?",
+        (skip - 1,),
+    ).fetchone()
+    conn.close()
+    return encode_cursor(created_at, debate_id)
+
+
+def measure(fn, repeat: int) -> float:
+    """1회 조회 중앙값(ms)"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    populate(args.rows)
+    print(f"rows={args.rows:,} (populated in {time.perf_counter() - start:.1f}s, {DB_FILE})")
+    print(f"{'depth':>10} {'offset(ms)':>12} {'keyset(ms)':>12}")
+
+    db = SessionLocal()
+    try:
+        depths = (0, 1_000, 100_000, args.rows // 2, args.rows - args.limit)
+        for depth in sorted({d for d in depths if 0 <= d < args.rows}):
+            cursor = cursor_at(depth) if depth else None
+            offset_ms = measure(lambda: offset_page(db, depth, args.limit), args.repeat)
+            keyset_ms = measure(
+                lambda: read_debates(cursor=cursor, limit=args.limit, db=db), args.repeat
+            )
+            print(f"{depth:>10,} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+    finally:
+        db.close()
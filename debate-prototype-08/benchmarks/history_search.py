@@ -0,0 +1,117 @@
+"""
+토론 검색 벤치마크 (FTS5)
+
+임시 SQLite DB에 토론 N건(기본 20만 건)을 만든 뒤, 검색어 길이/빈도별로
+/debates/search(search_debates) 한 번의 조회 시간을 측정합니다.
+
+- 2글자 검색어: 단어 접두사 색인 (debates_fts_prefix)
+- 3글자 이상 검색어: trigram 색인 (debates_fts)
+
+실행 (debate-prototype-08 디렉토리에서):
+    python benchmarks/history_search.py --rows 200000
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import _env  # noqa: F401  (경로/환경 설정)
+
+DB_DIR = tempfile.mkdtemp(prefix="search-bench-")
+DB_FILE = os.path.join(DB_DIR, "history.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{DB_FILE}"
+
+from db.database import Base, SessionLocal, engine  # noqa: E402
+from db.migrations import run_migrations  # noqa: E402
+from routers.history import search_debates  # noqa: E402
+from server.db import models  # noqa: E402,F401  (테이블 등록)
+
+# 발언 생성용 어휘 (흔한 단어와 드문 단어가 섞이도록 가중치 부여)
+COMMON_WORDS = ["규제", "정부", "경제", "사회", "원자력은", "효과", "비용", "안전", "미래", "기술"]
+RARE_WORDS = ["탄소국경세", "기본소득제", "양자암호", "우주태양광"]
+FILLER_WORDS = [f"단어{i}" for i in range(200)]
+
+# (설명, 검색어)
+QUERIES = [
+    ("2자 흔한 단어", "규제"),
+    ("2자 접두사", "원자"),
+    ("2자 없음", "퀴즈"),
+    ("3자+ 흔한 단어", "원자력"),
+    ("3자+ 드문 단어", "양자암호"),
+    ("3자+ 없음", "존재하지않는"),
+]
+
+
+def sentence(rng: random.Random) -> str:
+    words = rng.choices(FILLER_WORDS, k=8) + rng.choices(COMMON_WORDS, k=3)
+    if rng.random() < 0.01:
+        words.append(rng.choice(RARE_WORDS))
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+def populate(rows: int, batch: int = 20_000):
+    """토론 rows 건을 직접 삽입 (검색 색인은 트리거로 함께 갱신)"""
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1)
+    conn = sqlite3.connect(DB_FILE)
+    for offset in range(0, rows, batch):
+        items = []
+        for i in range(offset, min(offset + batch, rows)):
+            content = sentence(rng)
+            messages = json.dumps(
+                [{"role": "PRO_AGENT", "content": content, "current_round": 1}],
+                ensure_ascii=False,
+            )
+            created_at = (start + timedelta(seconds=i)).strftime("%Y-%m-%d %H:%M:%S")
+            items.append((f"토론 주제 {i}", messages, created_at, content[:120]))
+        conn.executemany(
+            "INSERT INTO debates (topic, rounds, messages, docs, created_at, preview, message_count) "
+            "VALUES (?, 1, ?, '{}', ?, ?, 1)",
+            items,
+        )
+        conn.commit()
+    conn.close()
+
+
+def measure(fn, repeat: int) -> float:
+    """1회 조회 중앙값(ms)"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    populate(args.rows)
+    print(f"rows={args.rows:,} (populated in {time.perf_counter() - start:.1f}s, {DB_FILE})")
+    print(f"{'query':<16} {'q':<12} {'results':>7} {'ms':>9}")
+
+    db = SessionLocal()
+    try:
+        for label, query in QUERIES:
+            results = search_debates(q=query, limit=args.limit, db=db)
+            elapsed = measure(
+                lambda: search_debates(q=query, limit=args.limit, db=db), args.repeat
+            )
+            print(f"{label:<16} {query:<12} {len(results):>7} {elapsed:>9.2f}")
+    finally:
+        db.close()
@@ -0,0 +1,72 @@
+"""
+웹 검색 동시 실행 벤치마크 (로컬 가짜 검색 백엔드 사용)
+
+검색어마다 지정된 지연 후 결과를 돌려주는 가짜 검색 백엔드로
+get_search_content 의 동시 실행, 타임아웃, 부분 결과 반환 동작을 확인합니다.
+
+실행 (debate-prototype-08 디렉토리에서):
+    python benchmarks/search_fanout.py --latencies 0.3 0.5 0.8 --slow 30
+"""
+
+import argparse
+import asyncio
+import time
+
+import _env  # noqa: F401  (경로/환경 설정)
+
+
+def make_fake_backend(latencies):
+    """검색어별로 지정된 지연 시간 후 결과를 반환하는 가짜 검색 백엔드"""
+    from retrieval.backends import SearchBackend
+
+    class FakeBackend(SearchBackend):
+        name = "fake"
+
+        def __init__(self):
+            self.delays = {}
+
+        def search(self, query, language, max_results):
+            time.sleep(self.delays[query])
+            return [
+                {
+                    "title": f"{query} {i}",
+                    "body": f"{query} 본문 {i}",
+                    "href": f"local://{query}/{i}",
+                }
+                for i in range(max_results)
+            ]
+
+    backend = FakeBackend()
+    queries = [f"검색어{i}" for i in range(len(latencies))]
+    backend.delays.update(zip(queries, latencies))
+    return backend, queries
+
+
+async def main(args):
+    from retrieval import search_service
+    from utils.config import settings
+
+    latencies = args.latencies + ([args.slow] if args.slow else [])
+    backend, queries = make_fake_backend(latencies)
+
+    start = time.perf_counter()
+    documents = await search_service.get_search_content(queries, backend=backend)
+    elapsed = time.perf_counter() - start
+
+    print(f"queries={len(queries)} latencies={latencies}")
+    print(f"sequential (sum of latencies) : {sum(latencies):.3f}s")
+    print(f"get_search_content            : {elapsed:.3f}s")
+    print(
+        f"documents={len(documents)} "
+        f"(timeout={settings.SEARCH_TIMEOUT}s deadline={settings.SEARCH_DEADLINE}s)"
+    )
+    print(f"latency histogram: {search_service.search_latency.snapshot()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latencies", type=float, nargs="+", default=[0.3, 0.5, 0.8])
+    parser.add_argument(
+        "--slow", type=float, default=30.0, help="타임아웃을 넘기는 검색어 지연 (0이면 생략)"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,128 @@
+"""
+/debate/stream 동시성 벤치마크
+
+스텁 LLM을 사용해 N개의 클라이언트가 동시에 토론 스트림을 요청할 때
+첫 발언 이벤트(token/message)까지의 시간(time-to-first-event)과 전체 소요 시간의 p50/p99를 측정합니다.
+(queued/debate 이벤트는 LLM 호출 전에 전송되므로 측정에서 제외)
+클라이언트마다 X-Client-Id 를 다르게 보내고 주소별 할당량을 클라이언트 수로 설정하며,
+대기열 포화 등으로 거절된 요청은 측정값에서 제외하고 따로 집계합니다.
+
+실행 (debate-prototype-08 디렉토리에서):
+    python benchmarks/stream_concurrency.py --clients 50 --latency 0.5 --max-concurrent 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+
+import _env  # noqa: F401  (경로/환경 설정)
+from _env import percentile
+
+import httpx
+import uvicorn
+
+# 첫 응답으로 측정할 이벤트 - 생성된 토큰 또는 완료된 발언
+FIRST_EVENT_TYPES = ("token", "message")
+
+
+async def run_client(client: httpx.AsyncClient, url: str, payload: dict, client_id: str):
+    """(첫 발언 이벤트까지의 시간, 전체 소요 시간) - 거절되면 응답 상태 코드, end 없이 끝나면 failed"""
+    start = time.perf_counter()
+    first_event = None
+    ended = False
+
+    async with client.stream(
+        "POST", url, json=payload, headers={"X-Client-Id": client_id}
+    ) as response:
+        if response.status_code != 200:
+            return response.status_code
+        async for line in response.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            event_type = json.loads(line[6:]).get("type")
+            if event_type in FIRST_EVENT_TYPES and first_event is None:
+                first_event = time.perf_counter() - start
+            if event_type == "end":
+                ended = True
+
+    # error 이벤트 후 종료되었거나 스트림이 중간에 끊긴 경우
+    if not ended:
+        return "failed"
+    return first_event or 0.0, time.perf_counter() - start
+
+
+async def main(args):
+    # 서버 설정은 임포트 시점에 읽으므로 먼저 지정
+    # 저장되는 토론/캐시는 저장소의 history.db 등이 아닌 임시 디렉토리에 기록
+    data_dir = tempfile.mkdtemp(prefix="stream-bench-")
+    os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(data_dir, 'history.db')}"
+    os.environ["QUERY_CACHE_PATH"] = os.path.join(data_dir, "query_cache.db")
+    os.environ["INDEX_CACHE_DIR"] = os.path.join(data_dir, "index_cache")
+
+    os.environ["MAX_CONCURRENT_DEBATES"] = str(args.max_concurrent)
+    os.environ["DEBATE_QUEUE_SIZE"] = str(args.clients)
+    os.environ["MAX_DEBATES_PER_CLIENT"] = "1"
+    # 모든 클라이언트가 같은 주소(127.0.0.1)에서 접속하므로 주소별 제한도 클라이언트 수만큼
+    os.environ["MAX_DEBATES_PER_ADDRESS"] = str(args.clients)
+
+    from stub_llm import install_stub_llm
+
+    install_stub_llm(args.latency)
+
+    from server.main import app
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning")
+    )
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    url = f"http://127.0.0.1:{args.port}/api/v1/workflow/debate/stream"
+    payload = {"topic": "벤치마크 주제", "max_rounds": args.rounds, "enable_rag": False}
+
+    try:
+        async with httpx.AsyncClient(timeout=None) as client:
+            results = await asyncio.gather(
+                *(
+                    run_client(client, url, payload, f"bench-{i}")
+                    for i in range(args.clients)
+                )
+            )
+    finally:
+        server.should_exit = True
+        await serve_task
+
+    completed = [result for result in results if isinstance(result, tuple)]
+    rejected = Counter(result for result in results if isinstance(result, int))
+    failed = sum(1 for result in results if result == "failed")
+    first_events = [first for first, _ in completed]
+    totals = [total for _, total in completed]
+
+    print(
+        f"clients={args.clients} rounds={args.rounds} llm_latency={args.latency}s "
+        f"max_concurrent={args.max_concurrent}"
+    )
+    print(f"completed={len(completed)} failed={failed} rejected={dict(rejected) or 0}")
+    print(
+        f"time-to-first-event  p50={percentile(first_events, 50):.3f}s  "
+        f"p99={percentile(first_events, 99):.3f}s"
+    )
+    print(
+        f"total                p50={percentile(totals, 50):.3f}s  "
+        f"p99={percentile(totals, 99):.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--max-concurrent", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8765)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,74 @@
+"""
+벤치마크용 스텁 LLM
+
+실제 Azure OpenAI 호출 대신 지정된 지연 후 고정 응답을 반환합니다.
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+class StubChatModel(BaseChatModel):
+    latency: float = 0.5  # 응답 전체 지연(초)
+    text: str = "스텁 응답입니다. " * 20
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _result(self) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.text))])
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self.latency)
+        return self._result()
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._result()
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        # 전체 지연을 토큰 수만큼 나눠서 토큰 단위로 생성
+        tokens = self.text.split(" ")
+        for token in tokens:
+            await asyncio.sleep(self.latency / len(tokens))
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token + " "))
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+def install_stub_llm(latency: float) -> StubChatModel:
+    """서버 모듈들이 사용하는 get_llm 을 스텁으로 교체합니다."""
+    import retrieval.search_service as search_service
+    import workflow.agents.agent as agent
+    import workflow.history as history
+
+    stub = StubChatModel(latency=latency)
+    agent.get_llm = lambda: stub
+    history.get_llm = lambda: stub  # 대화 기록 누적 요약
+    search_service.get_llm = lambda: stub
+    return stub
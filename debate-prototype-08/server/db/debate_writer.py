@@ -0,0 +1,174 @@
+# 토론 진행 중 서버 측 저장 - 발언을 모아 두었다가 일정 개수/시간마다 한 번에 커밋 (write-behind)
+# 진행 중에는 정규화 테이블에 새 행만 추가하고, messages/docs JSON 은 종료 시 한 번만 기록
+import asyncio
+import json
+import logging
+from contextlib import suppress
+from typing import Any, Dict, List, Optional, Tuple
+
+from db.database import SessionLocal
+from db.preview import preview_text
+from server.db.models import Debate as DebateModel
+from server.db.models import DebateDocument, DebateMessage
+
+logger = logging.getLogger(__name__)
+
+# 토론 상태 (debates.status)
+RUNNING = "running"
+COMPLETED = "completed"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+
+class DebateWriter:
+    """스트리밍 중인 토론의 발언/참고 자료를 DB에 저장
+
+    중간에 연결이 끊기거나 실패해도 그때까지의 발언은 debate_messages 에 남아 있어 다시 조회할 수 있음
+    (진행 중인 토론의 messages 는 조회 시 발언 행으로 재구성)
+    """
+
+    def __init__(self, topic: str, max_rounds: int, batch_size: int, flush_interval: float):
+        self.topic = topic
+        self.max_rounds = max_rounds
+        self.batch_size = batch_size  # 이 개수만큼 발언이 모이면 바로 저장
+        self.flush_interval = flush_interval  # 모이지 않아도 이 시간(초) 뒤에 저장
+
+        self.debate_id: Optional[int] = None
+        self.messages: List[Dict] = []
+        self.docs: Dict[str, List] = {}
+
+        self._pending_turns: List[Tuple[int, Dict]] = []  # (seq, 발언)
+        self._pending_roles: List[str] = []  # 참고 자료를 아직 저장하지 않은 역할
+        self._flush_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> int:
+        """진행 중 상태로 토론 행을 만들고 ID 반환"""
+        self.debate_id = await asyncio.to_thread(self._insert)
+        return self.debate_id
+
+    def observe(self, role: str, node: str, update: Dict[str, Any]):
+        """에이전트 노드 실행 결과에서 새 발언/참고 자료를 모아 둠"""
+        if self.debate_id is None:
+            return
+
+        debate_state = update.get("debate_state", {})
+
+        if node == "retrieve_context":
+            docs = debate_state.get("docs", {})
+            if role not in docs or role in self.docs:
+                return
+            self.docs[role] = list(docs[role])
+            self._pending_roles.append(role)
+
+        elif node == "update_state":
+            # messages 리스트는 그래프 실행 중 계속 추가되므로 응답 값으로 재구성
+            message = {
+                "role": role,
+                "content": update.get("response", ""),
+                "current_round": debate_state.get("current_round"),
+            }
+            self.messages.append(message)
+            token_count = (update.get("usage") or {}).get("completion_tokens")
+            self._pending_turns.append(
+                (len(self.messages) - 1, {**message, "token_count": token_count})
+            )
+
+        else:
+            return
+
+        if len(self._pending_turns) >= self.batch_size:
+            # 배치가 차면 대기 중인 타이머를 취소하고 바로 저장
+            if self._flush_task is not None and not self._flush_task.done():
+                self._flush_task.cancel()
+            self._flush_task = asyncio.create_task(self._flush_later(0))
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later(self.flush_interval))
+
+    async def _flush_later(self, delay: float):
+        await asyncio.sleep(delay)
+        # 저장 도중 취소되어도 쓰기는 끝까지 진행 (finish 에서 순서대로 이어서 저장)
+        await asyncio.shield(self.flush())
+
+    async def flush(self):
+        async with self._lock:
+            turns, self._pending_turns = self._pending_turns, []
+            roles, self._pending_roles = self._pending_roles, []
+            if not turns and not roles:
+                return
+            preview = next(
+                (preview_text(m["content"]) for m in self.messages if m["content"]), None
+            )
+            await asyncio.to_thread(
+                self._write,
+                turns,
+                [(role, self.docs[role]) for role in roles],
+                preview,
+                len(self.messages),
+            )
+
+    async def finish(self, status: str):
+        """남은 발언을 저장하고 최종 상태 기록"""
+        if self.debate_id is None:
+            return
+
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._flush_task
+
+        try:
+            await self.flush()
+            await asyncio.to_thread(self._finalize, status)
+        except Exception:
+            logger.exception("failed to persist debate %s", self.debate_id)
+
+    def _insert(self) -> int:
+        with SessionLocal() as db:
+            db_debate = DebateModel(
+                topic=self.topic,
+                rounds=self.max_rounds,
+                messages="[]",
+                docs="{}",
+                message_count=0,
+                status=RUNNING,
+            )
+            db.add(db_debate)
+            db.commit()
+            return db_debate.id
+
+    # 새 발언/참고 자료 행 추가 + 목록용 미리보기/발언 수만 갱신 (FTS 재색인 없음)
+    def _write(self, turns, docs, preview, message_count):
+        with SessionLocal() as db:
+            db.add_all(
+                DebateMessage(
+                    debate_id=self.debate_id,
+                    seq=seq,
+                    round=message["current_round"],
+                    role=message["role"],
+                    content=message["content"],
+                    token_count=message["token_count"],
+                )
+                for seq, message in turns
+            )
+            db.add_all(
+                DebateDocument(debate_id=self.debate_id, role=role, seq=seq, content=str(content))
+                for role, contents in docs
+                for seq, content in enumerate(contents)
+            )
+            db.query(DebateModel).filter(DebateModel.id == self.debate_id).update(
+                {"preview": preview, "message_count": message_count}
+            )
+            db.commit()
+
+    # 종료 시 전체 JSON 과 최종 상태를 한 번에 기록 (검색 색인도 이때 한 번만 갱신)
+    def _finalize(self, status: str):
+        with SessionLocal() as db:
+            db.query(DebateModel).filter(DebateModel.id == self.debate_id).update(
+                {
+                    "messages": json.dumps(self.messages, ensure_ascii=False),
+                    "docs": json.dumps(self.docs, ensure_ascii=False),
+                    "status": status,
+                }
+            )
+            db.commit()
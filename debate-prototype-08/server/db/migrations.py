@@ -0,0 +1,293 @@
+# 기존 DB 스키마 갱신 - create_all 은 이미 있는 테이블에 컬럼을 추가하지 않으므로 직접 처리
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from db.preview import summarize_messages
+from db.turns import docs_json, document_rows, message_rows, messages_json
+
+logger = logging.getLogger(__name__)
+
+# 발언 JSON 배열에서 content 만 이어 붙인 검색용 텍스트 (잘못된 JSON 이면 빈 문자열)
+MESSAGES_TEXT = """
+    CASE WHEN json_valid({messages}) THEN (
+        SELECT group_concat(json_extract(value, '$.content'), char(10))
+        FROM json_each({messages})
+    ) ELSE '' END
+"""
+
+
+def run_migrations(engine: Engine):
+    _add_debate_summary_columns(engine)
+    _add_debate_list_index(engine)
+    _create_debate_search_index(engine)
+    _create_debate_prefix_index(engine)
+    _backfill_debate_turns(engine)
+    _add_debate_status_column(engine)
+    _close_interrupted_debates(engine)
+
+
+# 토론 목록용 미리보기/발언 수 컬럼 추가 및 기존 데이터 채우기
+def _add_debate_summary_columns(engine: Engine):
+    columns = {column["name"] for column in inspect(engine).get_columns("debates")}
+    if {"preview", "message_count"} <= columns:
+        return
+
+    with engine.begin() as conn:
+        if "preview" not in columns:
+            conn.execute(text("ALTER TABLE debates ADD COLUMN preview VARCHAR(200)"))
+        if "message_count" not in columns:
+            conn.execute(text("ALTER TABLE debates ADD COLUMN message_count INTEGER"))
+
+        rows = conn.execute(text("SELECT id, messages FROM debates")).fetchall()
+        for debate_id, messages in rows:
+            preview, message_count = summarize_messages(messages)
+            conn.execute(
+                text(
+                    "UPDATE debates SET preview = :preview, "
+                    "message_count = :message_count WHERE id = :id"
+                ),
+                {"preview": preview, "message_count": message_count, "id": debate_id},
+            )
+
+
+# 목록 키셋 페이지네이션용 복합 인덱스
+def _add_debate_list_index(engine: Engine):
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_debates_created_at_id "
+                "ON debates (created_at, id)"
+            )
+        )
+
+
+# 주제 + 발언 내용 전문 검색 인덱스 (FTS5 trigram - 한국어도 부분 문자열로 검색)
+# debates 테이블 변경 시 트리거로 함께 갱신하므로 저장 경로와 관계없이 동기화됨
+def _create_debate_search_index(engine: Engine):
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = 'debates_fts'")
+            ).first()
+
+            conn.execute(
+                text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS debates_fts "
+                    "USING fts5(topic, content, tokenize = 'trigram')"
+                )
+            )
+            conn.execute(
+                text(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS debates_fts_insert AFTER INSERT ON debates
+                    BEGIN
+                        INSERT INTO debates_fts (rowid, topic, content)
+                        VALUES (new.id, new.topic, {MESSAGES_TEXT.format(messages="new.messages")});
+                    END
+                    """
+                )
+            )
+            conn.execute(
+                text(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS debates_fts_update
+                    AFTER UPDATE OF topic, messages ON debates
+                    BEGIN
+                        DELETE FROM debates_fts WHERE rowid = old.id;
+                        INSERT INTO debates_fts (rowid, topic, content)
+                        VALUES (new.id, new.topic, {MESSAGES_TEXT.format(messages="new.messages")});
+                    END
+                    """
+                )
+            )
+            conn.execute(
+                text(
+                    """
+                    CREATE TRIGGER IF NOT EXISTS debates_fts_delete AFTER DELETE ON debates
+                    BEGIN
+                        DELETE FROM debates_fts WHERE rowid = old.id;
+                    END
+                    """
+                )
+            )
+
+            # 새로 만든 경우 기존 토론 색인
+            if not exists:
+                conn.execute(
+                    text(
+                        f"""
+                        INSERT INTO debates_fts (rowid, topic, content)
+                        SELECT id, topic, {MESSAGES_TEXT.format(messages="messages")}
+                        FROM debates
+                        """
+                    )
+                )
+    except OperationalError as e:
+        # FTS5 trigram 을 지원하지 않는 SQLite (3.34 미만) - 검색 API만 비활성화
+        logger.warning("Full-text search index is not available: %s", e)
+
+
+# 3글자 미만 검색어용 단어 접두사 색인 (trigram 은 3글자 미만을 색인으로 찾지 못함)
+# 검색 결과 표시는 debates 컬럼을 사용하므로 본문은 저장하지 않는 contentless 테이블로 생성하고,
+# 삭제/수정 시에는 이전 값을 넘겨 색인에서 제거
+def _create_debate_prefix_index(engine: Engine):
+    old_text = MESSAGES_TEXT.format(messages="old.messages")
+    new_text = MESSAGES_TEXT.format(messages="new.messages")
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = 'debates_fts_prefix'")
+            ).first()
+
+            conn.execute(
+                text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS debates_fts_prefix "
+                    "USING fts5(topic, content, content = '', "
+                    "tokenize = 'unicode61', prefix = '1 2')"
+                )
+            )
+            conn.execute(
+                text(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS debates_fts_prefix_insert
+                    AFTER INSERT ON debates
+                    BEGIN
+                        INSERT INTO debates_fts_prefix (rowid, topic, content)
+                        VALUES (new.id, new.topic, {new_text});
+                    END
+                    """
+                )
+            )
+            conn.execute(
+                text(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS debates_fts_prefix_update
+                    AFTER UPDATE OF topic, messages ON debates
+                    BEGIN
+                        INSERT INTO debates_fts_prefix (debates_fts_prefix, rowid, topic, content)
+                        VALUES ('delete', old.id, old.topic, {old_text});
+                        INSERT INTO debates_fts_prefix (rowid, topic, content)
+                        VALUES (new.id, new.topic, {new_text});
+                    END
+                    """
+                )
+            )
+            conn.execute(
+                text(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS debates_fts_prefix_delete
+                    AFTER DELETE ON debates
+                    BEGIN
+                        INSERT INTO debates_fts_prefix (debates_fts_prefix, rowid, topic, content)
+                        VALUES ('delete', old.id, old.topic, {old_text});
+                    END
+                    """
+                )
+            )
+
+            # 새로 만든 경우 기존 토론 색인
+            if not exists:
+                conn.execute(
+                    text(
+                        f"""
+                        INSERT INTO debates_fts_prefix (rowid, topic, content)
+                        SELECT id, topic, {MESSAGES_TEXT.format(messages="messages")}
+                        FROM debates
+                        """
+                    )
+                )
+    except OperationalError as e:
+        logger.warning("Prefix search index is not available: %s", e)
+
+
+# messages/docs JSON 컬럼만 있는 기존 토론을 정규화 테이블로 옮김
+# (테이블은 create_all 로 생성되며, 발언 행이 없는 토론만 대상)
+def _backfill_debate_turns(engine: Engine):
+    with engine.begin() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT id, messages, docs FROM debates WHERE NOT EXISTS "
+                "(SELECT 1 FROM debate_messages m WHERE m.debate_id = debates.id)"
+            )
+        ).fetchall()
+
+        for debate_id, messages, docs in rows:
+            turns = [{"debate_id": debate_id, **row} for row in message_rows(messages)]
+            documents = [{"debate_id": debate_id, **row} for row in document_rows(docs)]
+            if not turns:
+                continue
+
+            conn.execute(
+                text(
+                    "INSERT INTO debate_messages "
+                    "(debate_id, round, role, seq, content, token_count) "
+                    "VALUES (:debate_id, :round, :role, :seq, :content, :token_count)"
+                ),
+                turns,
+            )
+            if documents:
+                conn.execute(
+                    text(
+                        "INSERT INTO debate_documents (debate_id, role, seq, content) "
+                        "VALUES (:debate_id, :role, :seq, :content)"
+                    ),
+                    documents,
+                )
+
+
+# 서버 측 저장 토론의 진행 상태 컬럼 (기존 토론은 완료 상태)
+def _add_debate_status_column(engine: Engine):
+    columns = {column["name"] for column in inspect(engine).get_columns("debates")}
+    if "status" in columns:
+        return
+
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "ALTER TABLE debates ADD COLUMN status VARCHAR(16) "
+                "NOT NULL DEFAULT 'completed'"
+            )
+        )
+
+
+# 서버가 종료/중단되어 진행 중 상태로 남은 토론을 실패로 마감
+# (시작 시점에는 이 DB를 쓰는 토론이 실행 중이지 않으므로 running 은 모두 중단된 토론)
+# 종료 시 기록하지 못한 messages/docs JSON 은 저장된 발언 행으로 채움
+def _close_interrupted_debates(engine: Engine):
+    with engine.begin() as conn:
+        debate_ids = conn.execute(
+            text("SELECT id FROM debates WHERE status = 'running'")
+        ).scalars().all()
+
+        for debate_id in debate_ids:
+            turns = conn.execute(
+                text(
+                    "SELECT role, content, round FROM debate_messages "
+                    "WHERE debate_id = :id ORDER BY seq"
+                ),
+                {"id": debate_id},
+            )
+            documents = conn.execute(
+                text(
+                    "SELECT role, content FROM debate_documents "
+                    "WHERE debate_id = :id ORDER BY role, seq"
+                ),
+                {"id": debate_id},
+            )
+            conn.execute(
+                text(
+                    "UPDATE debates SET status = 'failed', messages = :messages, "
+                    "docs = :docs WHERE id = :id"
+                ),
+                {
+                    "messages": messages_json(turns),
+                    "docs": docs_json(documents),
+                    "id": debate_id,
+                },
+            )
+
+    if debate_ids:
+        logger.info("marked %d interrupted debates as failed", len(debate_ids))
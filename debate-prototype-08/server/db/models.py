@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 
 from db.database import Base
@@ -13,4 +13,44 @@ class Debate(Base):
     rounds = Column(Integer, default=1)
     messages = Column(Text, nullable=False)  # JSON 문자열로 저장
     docs = Column(Text, nullable=True)  # JSON 문자열로 저장
+    preview = Column(String(200), nullable=True)  # 첫 발언 미리보기 (저장 시 계산)
+    message_count = Column(Integer, nullable=True)  # 발언 수 (저장 시 계산)
+    # running / completed / cancelled / failed (스트리밍 중 서버에서 저장하는 토론)
+    status = Column(String(16), nullable=False, default="completed", server_default="completed")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # 목록 키셋 페이지네이션 (created_at, id) 정렬용
+    __table_args__ = (Index("ix_debates_created_at_id", "created_at", "id"),)
+
+
+# 토론 발언 (debates.messages JSON 을 발언 단위로 정규화)
+class DebateMessage(Base):
+    __tablename__ = "debate_messages"
+
+    id = Column(Integer, primary_key=True)
+    debate_id = Column(Integer, ForeignKey("debates.id", ondelete="CASCADE"), nullable=False)
+    round = Column(Integer, nullable=True)
+    role = Column(String(32), nullable=False)
+    seq = Column(Integer, nullable=False)  # 토론 내 발언 순서
+    content = Column(Text, nullable=False)
+    token_count = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_debate_messages_debate_seq", "debate_id", "seq", unique=True),
+        Index("ix_debate_messages_debate_round", "debate_id", "round"),
+    )
+
+
+# 토론 참고 자료 (debates.docs JSON 을 문서 단위로 정규화)
+class DebateDocument(Base):
+    __tablename__ = "debate_documents"
+
+    id = Column(Integer, primary_key=True)
+    debate_id = Column(Integer, ForeignKey("debates.id", ondelete="CASCADE"), nullable=False)
+    role = Column(String(32), nullable=False)
+    seq = Column(Integer, nullable=False)  # 역할 내 문서 순서
+    content = Column(Text, nullable=False)
+
+    __table_args__ = (
+        Index("ix_debate_documents_debate_role_seq", "debate_id", "role", "seq"),
+    )
@@ -0,0 +1,33 @@
+# 토론 목록용 요약 정보 - 저장 시점에 한 번 계산하여 목록 조회 시 messages 를 읽지 않음
+import json
+import re
+from typing import Optional, Tuple
+
+PREVIEW_LENGTH = 120
+
+
+def preview_text(content: str) -> str:
+    """발언 한 개의 미리보기 (공백 정리 후 PREVIEW_LENGTH 자로 자름)"""
+    preview = re.sub(r"\s+", " ", content).strip()
+    if len(preview) > PREVIEW_LENGTH:
+        preview = preview[:PREVIEW_LENGTH].rstrip() + "…"
+    return preview
+
+
+def summarize_messages(messages: str) -> Tuple[Optional[str], int]:
+    """(첫 발언 미리보기, 발언 수)"""
+    try:
+        items = json.loads(messages) if messages else []
+    except json.JSONDecodeError:
+        return None, 0
+    if not isinstance(items, list):
+        return None, 0
+
+    preview = None
+    for item in items:
+        content = item.get("content") if isinstance(item, dict) else None
+        if content:
+            preview = preview_text(content)
+            break
+
+    return preview, len(items)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -18,6 +18,55 @@ class DebateCreate(DebateBase):
 class DebateSchema(DebateBase):
     id: int
     created_at: datetime
+    status: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+# 토론 목록용 요약 (messages/docs 제외)
+class DebateSummary(BaseModel):
+    id: int
+    topic: str
+    rounds: int
+    created_at: datetime
+    preview: Optional[str] = None
+    message_count: Optional[int] = None
+    status: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+# 토론 목록 페이지 (다음 페이지 커서 포함, 마지막 페이지면 None)
+class DebatePage(BaseModel):
+    items: List[DebateSummary]
+    next_cursor: Optional[str] = None
+
+
+# 토론 검색 결과 (관련도 순, snippet 은 일치 부분을 ** 로 강조한 발췌)
+class DebateSearchResult(DebateSummary):
+    snippet: Optional[str] = None
+    score: Optional[float] = None
+
+
+# 토론 발언 (정규화 테이블)
+class DebateTurnSchema(BaseModel):
+    seq: int
+    round: Optional[int] = None
+    role: str
+    content: str
+    token_count: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+# 토론 참고 자료 (정규화 테이블)
+class DebateDocumentSchema(BaseModel):
+    role: str
+    seq: int
+    content: str
 
     class Config:
         from_attributes = True
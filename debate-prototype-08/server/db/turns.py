@@ -0,0 +1,66 @@
+# 토론 JSON(messages/docs)을 정규화 테이블 행으로 변환
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def _load(value: Optional[str]):
+    try:
+        return json.loads(value) if value else None
+    except json.JSONDecodeError:
+        return None
+
+
+def message_rows(messages: Optional[str]) -> List[Dict]:
+    """발언 JSON 배열 -> debate_messages 행 (seq 는 배열 내 순서)"""
+    items = _load(messages)
+    if not isinstance(items, list):
+        return []
+
+    rows = []
+    for seq, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        rows.append(
+            {
+                "seq": seq,
+                "round": item.get("current_round"),
+                "role": item.get("role", ""),
+                "content": item.get("content", ""),
+                "token_count": item.get("token_count"),
+            }
+        )
+    return rows
+
+
+def document_rows(docs: Optional[str]) -> List[Dict]:
+    """역할별 참고 자료 JSON 객체 -> debate_documents 행 (seq 는 역할 내 순서)"""
+    items = _load(docs)
+    if not isinstance(items, dict):
+        return []
+
+    rows = []
+    for role, contents in items.items():
+        if not isinstance(contents, list):
+            continue
+        for seq, content in enumerate(contents):
+            rows.append({"role": role, "seq": seq, "content": str(content)})
+    return rows
+
+
+def messages_json(turns: Iterable[Any]) -> str:
+    """debate_messages 행(seq 순) -> 발언 JSON 배열"""
+    return json.dumps(
+        [
+            {"role": turn.role, "content": turn.content, "current_round": turn.round}
+            for turn in turns
+        ],
+        ensure_ascii=False,
+    )
+
+
+def docs_json(documents: Iterable[Any]) -> str:
+    """debate_documents 행(역할, seq 순) -> 역할별 참고 자료 JSON 객체"""
+    docs: Dict[str, List[str]] = {}
+    for document in documents:
+        docs.setdefault(document.role, []).append(document.content)
+    return json.dumps(docs, ensure_ascii=False)
@@ -1,4 +1,5 @@
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 # 절대 경로 임포트로 수정
@@ -6,16 +7,31 @@ from routers import workflow
 
 # 데이터베이스 초기화를 위한 임포트 추가
 from db.database import Base, engine
+from db.migrations import run_migrations
 from server.routers import history
+from retrieval.search_service import search_executor
+from utils.config import clients
 
-# 데이터베이스 초기화
+# 데이터베이스 초기화 (기존 DB는 스키마 갱신)
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 공유 LLM 클라이언트의 연결 풀 정리
+    await clients.aclose()
+    # 대기 중인 웹 검색은 실행하지 않음 (실행 중인 검색은 끝날 때까지 둠)
+    search_executor.shutdown(wait=False, cancel_futures=True)
+
 
 # FastAPI 인스턴스 생성
 app = FastAPI(
     title="Debate Arena API",
     description="AI Debate Arena 서비스를 위한 API",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # router 추가
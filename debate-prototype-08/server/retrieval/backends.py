@@ -0,0 +1,172 @@
+# 검색 백엔드 - 웹 검색(DuckDuckGo)과 로컬 문서 코퍼스
+import json
+import logging
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, List
+
+from duckduckgo_search import DDGS
+
+from retrieval.lexical import InvertedIndex
+from utils.config import settings
+
+MARKDOWN_HEADING = re.compile(r"^#{1,6}\s+(.+)$", re.MULTILINE)
+
+logger = logging.getLogger(__name__)
+
+
+class SearchBackend(ABC):
+    """검색어 하나를 검색하는 백엔드 (동기 API, 스레드에서 호출됨)"""
+
+    name: str
+
+    # 결과 형식: [{"title": ..., "body": ..., "href": ...}, ...]
+    @abstractmethod
+    def search(self, query: str, language: str, max_results: int) -> List[Dict]:
+        pass
+
+
+class DuckDuckGoBackend(SearchBackend):
+
+    name = "duckduckgo"
+
+    def search(self, query: str, language: str, max_results: int) -> List[Dict]:
+        return DDGS().text(
+            query,
+            region=language,
+            safesearch="moderate",
+            timelimit="y",  # 최근 1년 내 결과
+            max_results=max_results,
+        )
+
+
+class LocalCorpusBackend(SearchBackend):
+    """디렉토리의 JSONL/Markdown 문서를 역색인하여 검색하는 오프라인 백엔드
+
+    - JSONL: 한 줄에 {"title", "body" (또는 "content"), "href" (또는 "url"), "language"(선택)}
+    - Markdown: 제목(#) 단위로 나눈 섹션을 각각 하나의 문서로 색인
+    """
+
+    name = "local"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.documents: List[Dict] = []
+        self.index = InvertedIndex()
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def search(self, query: str, language: str, max_results: int) -> List[Dict]:
+        self._ensure_loaded()
+
+        results = []
+        # 언어 필터로 일부가 제외될 수 있으므로 여유 있게 조회
+        for doc_id, _ in self.index.search(query, max_results * 3):
+            document = self.documents[doc_id]
+            if document.get("language", language) != language:
+                continue
+            results.append(document)
+            if len(results) >= max_results:
+                break
+        return results
+
+    # 첫 검색 시 한 번만 코퍼스 색인
+    # 새 목록/색인에 모두 읽은 뒤 교체하여 중간에 실패해도 문서가 중복 추가되지 않도록 함
+    # (읽을 수 없는 파일/줄은 건너뛰고 기록)
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._loaded:
+                return
+
+            documents: List[Dict] = []
+            index = InvertedIndex()
+            if os.path.isdir(self.directory):
+                for root, _, files in os.walk(self.directory):
+                    for filename in sorted(files):
+                        path = os.path.join(root, filename)
+                        try:
+                            if filename.endswith(".jsonl"):
+                                self._load_jsonl(path, documents, index)
+                            elif filename.endswith(".md"):
+                                self._load_markdown(path, documents, index)
+                        except (OSError, UnicodeDecodeError) as e:
+                            logger.warning("skipping corpus file %s: %s", path, e)
+
+            self.documents, self.index = documents, index
+            self._loaded = True
+
+    @staticmethod
+    def _add(
+        documents: List[Dict],
+        index: InvertedIndex,
+        title: str,
+        body: str,
+        href: str,
+        language: str = None,
+    ):
+        if not body.strip():
+            return
+        document = {"title": title, "body": body.strip(), "href": href}
+        if language:
+            document["language"] = language
+        documents.append(document)
+        index.add(f"{title}\n{body}")
+
+    def _load_jsonl(self, path: str, documents: List[Dict], index: InvertedIndex):
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.warning("skipping malformed line %s:%d: %s", path, line_no, e)
+                    continue
+                if not isinstance(item, dict):
+                    logger.warning("skipping non-object line %s:%d", path, line_no)
+                    continue
+                self._add(
+                    documents,
+                    index,
+                    item.get("title", ""),
+                    item.get("body") or item.get("content", ""),
+                    item.get("href") or item.get("url") or f"local://{path}#{line_no}",
+                    item.get("language"),
+                )
+
+    def _load_markdown(self, path: str, documents: List[Dict], index: InvertedIndex):
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+
+        # 제목 위치를 기준으로 섹션 분리 (첫 제목 이전 내용은 파일 이름을 제목으로 사용)
+        headings = list(MARKDOWN_HEADING.finditer(text))
+        title = os.path.splitext(os.path.basename(path))[0]
+        start = 0
+        for section_no, heading in enumerate(headings):
+            self._add(
+                documents,
+                index,
+                title,
+                text[start : heading.start()],
+                f"local://{path}#{section_no}",
+            )
+            title = heading.group(1).strip()
+            start = heading.end()
+        self._add(documents, index, title, text[start:], f"local://{path}#{len(headings)}")
+
+
+# 요청에서 선택 가능한 검색 백엔드 이름
+SEARCH_BACKENDS = (DuckDuckGoBackend.name, LocalCorpusBackend.name)
+DEFAULT_SEARCH_BACKEND = DuckDuckGoBackend.name
+
+
+@lru_cache(maxsize=None)
+def get_search_backend(name: str = DEFAULT_SEARCH_BACKEND) -> SearchBackend:
+    if name == DuckDuckGoBackend.name:
+        return DuckDuckGoBackend()
+    if name == LocalCorpusBackend.name:
+        return LocalCorpusBackend(settings.LOCAL_CORPUS_DIR)
+    raise ValueError(f"Unknown search backend: {name}")
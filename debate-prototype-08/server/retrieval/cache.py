@@ -0,0 +1,93 @@
+# 비동기 생성 결과 캐시 (벡터 스토어, 검색어 등) - TTL + LRU, 동일 키 동시 생성 방지
+import asyncio
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+def normalize_topic(topic: str) -> str:
+    """캐시 키용 주제 정규화 (유니코드 정규화, 공백 정리, 소문자화)"""
+    topic = unicodedata.normalize("NFKC", topic)
+    return re.sub(r"\s+", " ", topic).strip().lower()
+
+
+class AsyncTTLCache:
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._pending: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # 생성 중인 항목을 함께 기다린 요청 수
+        self.evictions = 0
+
+    async def get_or_create(
+        self, key: Hashable, factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            # 만료된 항목 제거
+            del self._entries[key]
+            self.evictions += 1
+
+        # 같은 키를 생성 중이면 새로 만들지 않고 결과를 함께 기다림
+        task = self._pending.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(factory())
+            self._pending[key] = task
+            task.add_done_callback(lambda t: self._on_created(key, t))
+        else:
+            self.coalesced += 1
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # 기다리는 요청이 모두 취소되면 생성 작업도 중단
+            if self._waiters.get(key) == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def _on_created(self, key: Hashable, task: asyncio.Task):
+        self._pending.pop(key, None)
+
+        # 실패하거나 결과가 없는 경우는 캐시하지 않음
+        if task.cancelled() or task.exception() is not None:
+            return
+        value = task.result()
+        if value is None:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "pending": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,107 @@
+# 하이브리드 검색 - BM25 + 벡터 검색 결과를 Reciprocal Rank Fusion 으로 결합
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain.schema import Document
+from langchain_community.vectorstores import FAISS
+
+from retrieval.lexical import InvertedIndex, tokenize
+
+# RRF 상수 - 클수록 하위 순위 결과의 영향이 커짐
+RRF_K = 60
+
+
+class HybridIndex:
+    """한 코퍼스의 FAISS 인덱스와 BM25 역색인을 함께 보관하는 검색 인덱스
+
+    문서 metadata 의 "roles" 태그로 특정 역할이 수집한 문서만 검색할 수 있음
+    """
+
+    def __init__(self, vector_store: FAISS):
+        self.vector_store = vector_store
+
+        # FAISS 내부 위치 순서대로 문서를 꺼내 역색인 문서 ID와 맞춤
+        self.documents: List[Document] = [
+            vector_store.docstore.search(vector_store.index_to_docstore_id[i])
+            for i in range(vector_store.index.ntotal)
+        ]
+        self.lexical = InvertedIndex()
+        self.role_doc_ids: Dict[str, set] = defaultdict(set)  # 역할 -> 문서 ID
+        for doc_id, document in enumerate(self.documents):
+            self.lexical.add(document.page_content)
+            for role in document.metadata.get("roles", []):
+                self.role_doc_ids[role].add(doc_id)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    async def search_many(
+        self,
+        queries: List[str],
+        k: int,
+        fetch_k: int = 20,
+        rerank: bool = False,
+        roles: Optional[Sequence[str]] = None,
+    ) -> List[Document]:
+        """여러 검색어의 결과를 한 번에 검색하여 하나의 순위로 합친 상위 k개 문서
+
+        roles 가 주어지면 해당 역할 태그가 붙은 문서만 검색
+        """
+        doc_ids = None
+        if roles is not None:
+            doc_ids = set().union(*(self.role_doc_ids.get(role, ()) for role in roles))
+            if not doc_ids:
+                return []
+
+        if not queries or not self.documents:
+            return []
+
+        fetch_k = min(max(fetch_k, k), len(self.documents))
+        # 역할 필터가 있으면 필터 후에도 후보가 충분하도록 전체 문서를 대상으로 벡터 검색
+        vector_k = len(self.documents) if doc_ids is not None else fetch_k
+
+        # 모든 검색어를 한 번의 임베딩 호출 + 한 번의 FAISS 검색으로 처리
+        vectors = await self.vector_store.embeddings.aembed_documents(queries)
+        _, positions = self.vector_store.index.search(
+            np.array(vectors, dtype=np.float32), vector_k
+        )
+
+        scores: Dict[int, float] = defaultdict(float)
+        for query, vector_hits in zip(queries, positions):
+            vector_ranking = [
+                int(doc_id)
+                for doc_id in vector_hits
+                if doc_id >= 0 and (doc_ids is None or int(doc_id) in doc_ids)
+            ]
+            rankings = [
+                vector_ranking[:fetch_k],
+                [doc_id for doc_id, _ in self.lexical.search(query, fetch_k, doc_ids)],
+            ]
+            for ranking in rankings:
+                for rank, doc_id in enumerate(ranking):
+                    scores[doc_id] += 1 / (RRF_K + rank + 1)
+
+        candidates = sorted(scores, key=scores.get, reverse=True)[:fetch_k]
+        if rerank:
+            candidates = self._rerank(queries, candidates, scores)
+
+        return [self.documents[doc_id] for doc_id in candidates[:k]]
+
+    # 로컬 재정렬 - 검색어 토큰이 문서에 얼마나 포함되는지를 RRF 점수와 함께 반영
+    def _rerank(
+        self, queries: List[str], candidates: List[int], scores: Dict[int, float]
+    ) -> List[int]:
+        query_tokens = [set(tokenize(query)) for query in queries]
+        query_tokens = [tokens for tokens in query_tokens if tokens]
+        if not query_tokens or not candidates:
+            return candidates
+
+        top_score = scores[candidates[0]]
+
+        def score(doc_id: int) -> float:
+            doc_tokens = set(tokenize(self.documents[doc_id].page_content))
+            coverage = max(len(tokens & doc_tokens) / len(tokens) for tokens in query_tokens)
+            return scores[doc_id] / top_score + coverage
+
+        return sorted(candidates, key=score, reverse=True)
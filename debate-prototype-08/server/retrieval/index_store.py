@@ -0,0 +1,124 @@
+# 검색 인덱스 디스크 캐시 - 재시작/다른 워커에서 임베딩 없이 인덱스를 다시 읽음, 전체 크기 기준 LRU 정리
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from typing import Optional
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+
+META_FILE = "meta.json"
+
+
+class IndexStore:
+    """주제별 FAISS 인덱스와 문서 저장소를 디렉토리에 저장하여 재시작/워커 간 공유
+
+    항목마다 하위 디렉토리 하나를 사용하고, 임시 디렉토리에 쓴 뒤 이름을 바꿔
+    다른 워커가 쓰는 도중의 파일을 읽지 않도록 함
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_age: float):
+        self.directory = directory
+        self.max_bytes = max_bytes  # 전체 디스크 사용량 제한
+        self.max_age = max_age  # 저장 후 유효 기간(초)
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: tuple) -> str:
+        name = hashlib.sha256(json.dumps(key, ensure_ascii=False).encode("utf-8"))
+        return os.path.join(self.directory, name.hexdigest())
+
+    def load(self, key: tuple, embeddings: Embeddings) -> Optional[FAISS]:
+        path = self._path(key)
+        try:
+            with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["created_at"] + self.max_age < time.time():
+                self.misses += 1
+                return None
+
+            # 인덱스는 IndexFlatL2 라 메모리 매핑을 지원하지 않음 - 워커마다 메모리로 읽음
+            # 문서 저장소(index.pkl)는 pickle 이므로 이 서버가 직접 쓴 캐시 디렉토리만 신뢰하여 로드
+            vector_store = FAISS.load_local(
+                path, embeddings, allow_dangerous_deserialization=True
+            )
+        except (OSError, EOFError, ValueError, KeyError, RuntimeError, pickle.UnpicklingError):
+            # 없거나 다른 워커가 정리 중인 항목은 캐시 미스로 처리
+            self.misses += 1
+            return None
+
+        # 마지막 사용 시각 갱신 (LRU 정리 기준)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return vector_store
+
+    def save(self, key: tuple, vector_store: FAISS):
+        path = self._path(key)
+        tmp_path = tempfile.mkdtemp(dir=self.directory, prefix=".tmp-")
+        try:
+            vector_store.save_local(tmp_path)
+            with open(os.path.join(tmp_path, META_FILE), "w", encoding="utf-8") as f:
+                json.dump({"key": key, "created_at": time.time()}, f, ensure_ascii=False)
+
+            # 이전 항목(만료 등)이 있으면 교체
+            shutil.rmtree(path, ignore_errors=True)
+            os.rename(tmp_path, path)
+        except OSError:
+            # 다른 워커가 먼저 저장한 경우 등 - 임시 디렉토리만 정리
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+
+        self.evict()
+
+    # 저장된 항목 목록 [(마지막 사용 시각, 크기, 경로)]
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith(".tmp-") or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(
+                    entry.stat().st_size for entry in os.scandir(path) if entry.is_file()
+                )
+                entries.append((os.stat(path).st_mtime, size, path))
+            except OSError:
+                continue
+        return entries
+
+    def evict(self):
+        """전체 크기가 제한을 넘으면 가장 오래 사용되지 않은 항목부터 삭제"""
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,72 @@
+# 어휘 기반 검색 - 토큰화 및 BM25 역색인
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Collection, Dict, List, Optional, Tuple
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+HANGUL_PATTERN = re.compile(r"[가-힣]")
+
+
+def tokenize(text: str) -> List[str]:
+    """단어 단위 토큰화 - 한글 단어는 조사/어미 처리를 위해 글자 bigram도 추가"""
+    tokens = []
+    for word in WORD_PATTERN.findall(unicodedata.normalize("NFKC", text).lower()):
+        tokens.append(word)
+        if len(word) > 2 and HANGUL_PATTERN.search(word):
+            tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class InvertedIndex:
+    """BM25 점수로 검색하는 역색인"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, int]] = defaultdict(dict)  # 용어 -> {문서 ID: 빈도}
+        self.doc_lengths: List[int] = []
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, text: str) -> int:
+        """문서를 색인하고 문서 ID(추가 순서)를 반환"""
+        doc_id = len(self.doc_lengths)
+        term_counts = Counter(tokenize(text))
+
+        for term, count in term_counts.items():
+            self.postings[term][doc_id] = count
+
+        length = sum(term_counts.values())
+        self.doc_lengths.append(length)
+        self.total_length += length
+        return doc_id
+
+    def search(
+        self, query: str, k: int, doc_ids: Optional[Collection[int]] = None
+    ) -> List[Tuple[int, float]]:
+        """BM25 점수 상위 k개의 (문서 ID, 점수) 목록 (doc_ids 가 있으면 해당 문서만)"""
+        if not self.doc_lengths:
+            return []
+
+        n = len(self.doc_lengths)
+        avg_length = self.total_length / n or 1.0
+        scores: Dict[int, float] = defaultdict(float)
+
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, tf in posting.items():
+                if doc_ids is not None and doc_id not in doc_ids:
+                    continue
+                norm = 1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
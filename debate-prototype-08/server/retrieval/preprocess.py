@@ -0,0 +1,161 @@
+# 색인 전 문서 전처리 - URL 정규화, 중복/유사 문서 제거, 청크 분할
+import hashlib
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from langchain.schema import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from retrieval.lexical import tokenize
+
+SIMHASH_BITS = 64
+
+# 같은 페이지를 가리키지만 값만 다른 추적용 쿼리 파라미터
+TRACKING_PARAMS = {"fbclid", "gclid", "igshid", "mc_cid", "mc_eid", "ref", "ref_src"}
+
+
+def canonicalize_url(url: str) -> str:
+    """같은 페이지의 서로 다른 URL 표기를 하나로 통일"""
+    parts = urlsplit(url.strip())
+    # 로컬 코퍼스(local://) 등 웹 URL 이 아닌 출처는 그대로 사용
+    if parts.scheme.lower() not in ("http", "https") or not parts.netloc:
+        return url.strip()
+
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.endswith(":80") or host.endswith(":443"):
+        host = host.rsplit(":", 1)[0]
+
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_") and name.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+
+    # http/https 는 같은 문서로 취급, fragment(#...) 는 제거
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def merge_roles(kept: Document, duplicate: Document):
+    """중복으로 제거되는 문서의 역할 태그를 남는 문서에 합침"""
+    roles = kept.metadata.get("roles")
+    if roles is None:
+        return
+    for role in duplicate.metadata.get("roles", []):
+        if role not in roles:
+            roles.append(role)
+
+
+def simhash(text: str) -> int:
+    """토큰 해시 기반 64비트 SimHash (비슷한 문서일수록 비트 차이가 적음)"""
+    weights = [0] * SIMHASH_BITS
+    for token in tokenize(text):
+        value = int.from_bytes(
+            hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class DocumentPreprocessor:
+    """검색 결과를 임베딩하기 전에 중복을 제거하고 청크로 분할"""
+
+    def __init__(self, chunk_size: int, chunk_overlap: int, max_distance: int):
+        self.splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap
+        )
+        self.max_distance = max_distance  # 유사 문서로 볼 SimHash 최대 비트 차이
+
+        self.documents = 0  # 입력 문서 수
+        self.url_duplicates = 0  # 같은 URL 로 제거된 문서 수
+        self.near_duplicates = 0  # 내용이 거의 같아 제거된 문서 수
+        self.chunk_duplicates = 0  # 내용이 같아 제거된 청크 수
+        self.chunks = 0  # 색인된 청크 수
+        self.embeddings_saved = 0  # 중복 제거로 생략된 임베딩 수
+
+    def process(self, documents: List[Document]) -> List[Document]:
+        unique, removed = self._deduplicate(documents)
+
+        chunks = []
+        seen_chunks: Dict[bytes, Document] = {}
+        for document in unique:
+            for i, text in enumerate(self.splitter.split_text(document.page_content)):
+                digest = hashlib.sha256(text.strip().encode("utf-8")).digest()
+                if digest in seen_chunks:
+                    merge_roles(seen_chunks[digest], document)
+                    self.chunk_duplicates += 1
+                    self.embeddings_saved += 1
+                    continue
+
+                metadata = {**document.metadata, "chunk": i}
+                if "roles" in metadata:
+                    metadata["roles"] = list(metadata["roles"])
+                chunk = Document(page_content=text, metadata=metadata)
+                seen_chunks[digest] = chunk
+                chunks.append(chunk)
+
+        # 제거된 문서가 만들었을 청크 수만큼 임베딩 호출이 줄어듦
+        for document in removed:
+            self.embeddings_saved += len(self.splitter.split_text(document.page_content))
+
+        self.documents += len(documents)
+        self.chunks += len(chunks)
+        return chunks
+
+    # URL 이 같거나 SimHash 가 가까운 문서 제거 (먼저 나온 문서 유지)
+    def _deduplicate(
+        self, documents: List[Document]
+    ) -> Tuple[List[Document], List[Document]]:
+        unique, removed = [], []
+        urls: Dict[str, Document] = {}
+        fingerprints: List[Tuple[int, Document]] = []
+
+        for document in documents:
+            source = document.metadata.get("source")
+            url = canonicalize_url(source) if source else None
+            if url and url in urls:
+                merge_roles(urls[url], document)
+                self.url_duplicates += 1
+                removed.append(document)
+                continue
+
+            fingerprint = simhash(document.page_content)
+            kept = next(
+                (
+                    other
+                    for other_fingerprint, other in fingerprints
+                    if bin(fingerprint ^ other_fingerprint).count("1") <= self.max_distance
+                ),
+                None,
+            )
+            if kept is not None:
+                merge_roles(kept, document)
+                self.near_duplicates += 1
+                removed.append(document)
+                continue
+
+            if url:
+                urls[url] = document
+                document.metadata["source"] = url
+            fingerprints.append((fingerprint, document))
+            unique.append(document)
+
+        return unique, removed
+
+    def stats(self) -> dict:
+        return {
+            "documents": self.documents,
+            "url_duplicates": self.url_duplicates,
+            "near_duplicates": self.near_duplicates,
+            "chunk_duplicates": self.chunk_duplicates,
+            "chunks": self.chunks,
+            "embeddings_saved": self.embeddings_saved,
+        }
@@ -1,92 +1,226 @@
+import asyncio
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
 from langchain.schema import Document
-from typing import List, Literal
-from duckduckgo_search import DDGS
+from typing import Dict, List, Literal, Optional
 from langchain.schema import HumanMessage, SystemMessage
-from utils.config import get_llm
-
-
-def improve_search_query(
+from retrieval.backends import SearchBackend, get_search_backend
+from retrieval.cache import AsyncTTLCache, normalize_topic
+from utils.config import get_llm, settings
+from utils.metrics import LatencyHistogram
+from utils.sqlite_store import SQLiteStore
+
+# 프로세스 전체의 동시 웹 검색 수 제한 - 검색 전용 스레드 풀
+# (타임아웃으로 기다리기를 포기해도 스레드가 끝날 때까지 자리를 차지하므로 실제 실행 중인 검색 수가 제한됨)
+search_executor = ThreadPoolExecutor(
+    max_workers=settings.SEARCH_MAX_CONCURRENCY, thread_name_prefix="web-search"
+)
+
+# 검색어별 검색 지연 시간 (모든 백엔드 합산)
+search_latency = LatencyHistogram()
+
+# 검색어 개선 결과 캐시 - 메모리 LRU 앞단 + SQLite 영구 저장 (재시작/워커 간 공유)
+query_cache = AsyncTTLCache(
+    max_entries=settings.QUERY_CACHE_SIZE, ttl=settings.QUERY_CACHE_TTL
+)
+query_store = SQLiteStore(
+    settings.QUERY_CACHE_PATH,
+    table="query_rewrites",
+    max_entries=settings.QUERY_CACHE_MAX_ENTRIES,
+    ttl=settings.QUERY_CACHE_TTL,
+)
+
+SEARCH_EXPERT_PROMPT = "당신은 검색 전문가입니다. 주어진 주제에 대해 가장 관련성 높은 검색어를 제안해주세요."
+
+PERSPECTIVE_MAP = {
+    "PRO_AGENT": "찬성하는 입장을 뒷받침할 수 있는 사실과 정보를 찾고자 합니다.",
+    "CON_AGENT": "반대하는 입장을 뒷받침할 수 있는 사실과 정보를 찾고자 합니다.",
+    "JUDGE_AGENT": "객관적인 사실과 정보를 찾고자 합니다.",
+}
+
+# 검색어를 생성하는 역할 (공유 코퍼스의 역할 태그)
+SEARCH_ROLES = tuple(PERSPECTIVE_MAP)
+
+JSON_BLOCK = re.compile(r"\{.*\}", re.DOTALL)
+
+
+async def improve_search_query(
     topic: str,
     role: Literal["PRO_AGENT", "CON_AGENT", "JUDGE_AGENT"] = "JUDGE_AGENT",
 ) -> List[str]:
 
-    template = "'{topic}'에 대해 {perspective} 웹검색에 적합한 3개의 검색어를 제안해주세요. 각 검색어는 25자 이내로 작성하고 콤마로 구분하세요. 검색어만 제공하고 설명은 하지 마세요."
+    if settings.BATCH_QUERY_REWRITE:
+        # 세 역할의 검색어를 한 번에 생성해 두고 역할별로 꺼내 씀
+        queries = await improve_search_queries(topic)
+        if queries.get(role):
+            return queries[role]
+
+    key = ("role", normalize_topic(topic), role)
+    queries = await query_cache.get_or_create(
+        key, lambda: _load_or_rewrite(key, lambda: _rewrite_query(topic, role))
+    )
+    return queries or []
+
+
+async def improve_search_queries(topic: str) -> Dict[str, List[str]]:
+    """찬성/반대/심판 검색어를 한 번의 LLM 호출로 생성 (주제별 캐시)"""
+    key = ("batch", normalize_topic(topic))
+    queries = await query_cache.get_or_create(
+        key, lambda: _load_or_rewrite(key, lambda: _rewrite_all_queries(topic))
+    )
+    return queries or {}
+
+
+# SQLite 캐시에 없을 때만 LLM으로 검색어 생성
+# 빈 결과는 None 으로 반환하여 메모리 캐시에도 남기지 않음 (다음 요청에서 다시 시도)
+async def _load_or_rewrite(key: tuple, rewrite):
+    store_key = json.dumps(key, ensure_ascii=False)
+    found = await asyncio.to_thread(query_store.mget, [store_key])
+    if store_key in found:
+        return json.loads(found[store_key])
+
+    queries = await rewrite()
+    if not queries:
+        return None
+
+    value = json.dumps(queries, ensure_ascii=False).encode("utf-8")
+    await asyncio.to_thread(query_store.mset, {store_key: value})
+    return queries
 
-    perspective_map = {
-        "PRO_AGENT": "찬성하는 입장을 뒷받침할 수 있는 사실과 정보를 찾고자 합니다.",
-        "CON_AGENT": "반대하는 입장을 뒷받침할 수 있는 사실과 정보를 찾고자 합니다.",
-        "JUDGE_AGENT": "객관적인 사실과 정보를 찾고자 합니다.",
-    }
 
-    prompt = template.format(topic=topic, perspective=perspective_map[role])
+async def _rewrite_query(topic: str, role: str) -> List[str]:
+
+    template = "'{topic}'에 대해 {perspective} 웹검색에 적합한 3개의 검색어를 제안해주세요. 각 검색어는 25자 이내로 작성하고 콤마로 구분하세요. 검색어만 제공하고 설명은 하지 마세요."
+
+    prompt = template.format(topic=topic, perspective=PERSPECTIVE_MAP[role])
 
     messages = [
-        SystemMessage(
-            content="당신은 검색 전문가입니다. 주어진 주제에 대해 가장 관련성 높은 검색어를 제안해주세요."
-        ),
+        SystemMessage(content=SEARCH_EXPERT_PROMPT),
         HumanMessage(content=prompt),
     ]
 
-    # 스트리밍 응답 받기
-    response = get_llm().invoke(messages)
+    # 비동기 호출 - 토론이 취소되면 HTTP 요청도 함께 중단됨
+    response = await get_llm().ainvoke(messages)
 
     # ,로 구분된 검색어 추출
     suggested_queries = [q.strip() for q in response.content.split(",")]
 
-    return suggested_queries[:3]
+    return [q for q in suggested_queries if q][:3]
 
 
-def get_search_content(
-    improved_queries: str,
-    language: str = "ko",
-    max_results: int = 5,
+async def _rewrite_all_queries(topic: str) -> Dict[str, List[str]]:
+
+    perspectives = "\n".join(
+        f"- {role}: {perspective}" for role, perspective in PERSPECTIVE_MAP.items()
+    )
+    prompt = f"""'{topic}'에 대해 아래 각 관점별로 웹검색에 적합한 3개의 검색어를 제안해주세요.
+{perspectives}
+
+각 검색어는 25자 이내로 작성하세요. 설명 없이 다음 JSON 형식으로만 답하세요.
+{{"PRO_AGENT": ["검색어1", "검색어2", "검색어3"], "CON_AGENT": [...], "JUDGE_AGENT": [...]}}"""
+
+    messages = [
+        SystemMessage(content=SEARCH_EXPERT_PROMPT),
+        HumanMessage(content=prompt),
+    ]
+
+    response = await get_llm().ainvoke(
+        messages, response_format={"type": "json_object"}
+    )
+
+    # JSON 파싱 실패 또는 누락된 역할은 빈 목록 (역할별 개별 호출로 대체됨)
+    match = JSON_BLOCK.search(response.content)
+    try:
+        parsed = json.loads(match.group(0)) if match else {}
+    except json.JSONDecodeError:
+        parsed = {}
+
+    queries = {}
+    for role in PERSPECTIVE_MAP:
+        values = parsed.get(role)
+        if isinstance(values, list):
+            queries[role] = [str(q).strip() for q in values if str(q).strip()][:3]
+    return queries
+
+
+async def _search_query(
+    query: str, language: str, max_results: int, backend: SearchBackend
 ) -> List[Document]:
 
+    start = time.perf_counter()
     try:
-        documents = []
-
-        ddgs = DDGS()
-
-        # 각 개선된 검색어에 대해 검색 수행
-        for query in improved_queries:
-            try:
-                # 검색 수행
-                results = ddgs.text(
-                    query,
-                    region=language,
-                    safesearch="moderate",
-                    timelimit="y",  # 최근 1년 내 결과
-                    max_results=max_results,
+        # 검색어별 타임아웃 (검색 백엔드는 동기 API이므로 검색 전용 스레드 풀에서 실행)
+        # 풀이 가득 차 대기하는 시간도 타임아웃에 포함되며, 시작 전에 취소되면 실행하지 않음
+        loop = asyncio.get_running_loop()
+        results = await asyncio.wait_for(
+            loop.run_in_executor(
+                search_executor, backend.search, query, language, max_results
+            ),
+            timeout=settings.SEARCH_TIMEOUT,
+        )
+        search_latency.observe(time.perf_counter() - start, "ok")
+    except asyncio.TimeoutError:
+        search_latency.observe(time.perf_counter() - start, "timeout")
+        st.warning(f"검색 시간 초과: {query}")
+        return []
+    except Exception as e:
+        search_latency.observe(time.perf_counter() - start, "error")
+        st.warning(f"검색 중 오류 발생: {str(e)}")
+        return []
+
+    # 검색 결과 처리
+    documents = []
+    for result in results or []:
+        title = result.get("title", "")
+        body = result.get("body", "")
+        url = result.get("href", "")
+
+        if body:
+            documents.append(
+                Document(
+                    page_content=body,
+                    metadata={
+                        "source": url,
+                        "section": "content",
+                        "topic": title,
+                        "query": query,
+                    },
                 )
+            )
+    return documents
 
-                if not results:
-                    continue
-
-                # 검색 결과 처리
-                for result in results:
-                    title = result.get("title", "")
-                    body = result.get("body", "")
-                    url = result.get("href", "")
-
-                    if body:
-                        documents.append(
-                            Document(
-                                page_content=body,
-                                metadata={
-                                    "source": url,
-                                    "section": "content",
-                                    "topic": title,
-                                    "query": query,
-                                },
-                            )
-                        )
-
-            except Exception as e:
-                st.warning(f"검색 중 오류 발생: {str(e)}")
-
-        return documents
 
-    except Exception as e:
-        st.error(f"검색 서비스 오류 발생: {str(e)}")
+async def get_search_content(
+    improved_queries: List[str],
+    language: str = "ko",
+    max_results: int = 5,
+    backend: Optional[SearchBackend] = None,
+) -> List[Document]:
+
+    backend = backend or get_search_backend()
+
+    # 각 개선된 검색어에 대해 동시에 검색 수행
+    tasks = [
+        asyncio.create_task(_search_query(query, language, max_results, backend))
+        for query in improved_queries
+    ]
+    if not tasks:
         return []
+
+    try:
+        # 마감 시간까지 끝난 검색 결과만 사용 (나머지는 취소)
+        done, _ = await asyncio.wait(tasks, timeout=settings.SEARCH_DEADLINE)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    documents = []
+    for task in tasks:  # 검색어 순서 유지
+        if task in done:
+            documents.extend(task.result())
+    return documents
@@ -1,35 +1,151 @@
+import asyncio
 import streamlit as st
+from langchain.schema import Document
 from langchain_community.vectorstores import FAISS
-from typing import Any, Dict, Optional, List
-from retrieval.search_service import get_search_content, improve_search_query
-from utils.config import get_embeddings
+from typing import Dict, Optional, List, Tuple
+from retrieval.backends import DEFAULT_SEARCH_BACKEND, get_search_backend
+from retrieval.cache import AsyncTTLCache, normalize_topic
+from retrieval.hybrid import HybridIndex
+from retrieval.index_store import IndexStore
+from retrieval.preprocess import DocumentPreprocessor
+from retrieval.search_service import (
+    SEARCH_ROLES,
+    get_search_content,
+    improve_search_query,
+)
+from utils.config import get_embeddings, settings
 
+# 주제/언어/검색 백엔드별 공유 검색 인덱스 캐시 (검색어 개선 + 웹 검색 + 임베딩 결과 재사용)
+corpus_cache = AsyncTTLCache(
+    max_entries=settings.CORPUS_CACHE_SIZE, ttl=settings.CORPUS_CACHE_TTL
+)
 
-def get_topic_vector_store(
-    topic: str, role: str, language: str = "ko"
+# 생성한 인덱스를 디스크에 저장하여 서버 재시작/다른 워커에서 재사용
+index_store = IndexStore(
+    settings.INDEX_CACHE_DIR,
+    max_bytes=settings.INDEX_CACHE_MAX_BYTES,
+    max_age=settings.INDEX_CACHE_MAX_AGE,
+)
+
+# 색인 전 중복 제거 및 청크 분할 (누적 통계 포함)
+preprocessor = DocumentPreprocessor(
+    chunk_size=settings.CHUNK_SIZE,
+    chunk_overlap=settings.CHUNK_OVERLAP,
+    max_distance=settings.NEAR_DUPLICATE_DISTANCE,
+)
+
+
+async def load_or_build_topic_index(
+    key: tuple,
+    topic: str,
+    language: str = "ko",
+    search_backend: str = DEFAULT_SEARCH_BACKEND,
+) -> Optional[HybridIndex]:
+
+    # 임베딩 모델이 바뀌면 디스크 캐시도 분리
+    store_key = (*key, settings.AOAI_EMBEDDING_DEPLOYMENT)
+    vector_store = await asyncio.to_thread(index_store.load, store_key, get_embeddings())
+    if vector_store is not None:
+        return HybridIndex(vector_store)
+
+    vector_store = await build_topic_vector_store(topic, language, search_backend)
+    if vector_store is None:
+        return None
+
+    await asyncio.to_thread(index_store.save, store_key, vector_store)
+    return HybridIndex(vector_store)
+
+
+async def build_topic_vector_store(
+    topic: str,
+    language: str = "ko",
+    search_backend: str = DEFAULT_SEARCH_BACKEND,
 ) -> Optional[FAISS]:
 
-    # 검색어 개선
-    improved_queries = improve_search_query(topic, role)
-    # 개선된 검색어로 검색 콘텐츠 가져오기
-    documents = get_search_content(improved_queries, language)
+    # 역할별 검색어 개선 (배치 설정 시 한 번의 LLM 호출)
+    role_queries = await asyncio.gather(
+        *(improve_search_query(topic, role) for role in SEARCH_ROLES)
+    )
+    # 역할별 검색을 동시에 수행하고 수집한 역할을 태그로 기록
+    backend = get_search_backend(search_backend)
+    role_documents = await asyncio.gather(
+        *(get_search_content(queries, language, backend=backend) for queries in role_queries)
+    )
+    documents = []
+    for role, docs in zip(SEARCH_ROLES, role_documents):
+        for doc in docs:
+            doc.metadata["roles"] = [role]
+        documents.extend(docs)
+
+    # 역할 간 중복 문서는 하나로 합치고(역할 태그 병합) 청크 단위로 색인
+    documents = preprocessor.process(documents)
     if not documents:
         return None
     try:
-        return FAISS.from_documents(documents, get_embeddings())
+        return await FAISS.afrom_documents(documents, get_embeddings())
     except Exception as e:
         st.error(f"Vector DB 생성 중 오류 발생: {str(e)}")
         return None
 
 
-def search_topic(topic: str, role: str, query: str, k: int = 5) -> List[Dict[str, Any]]:
-    # 문서를 검색해서 벡터 스토어 생성
-    vector_store = get_topic_vector_store(topic, role)
-    if not vector_store:
+async def get_topic_index(
+    topic: str,
+    language: str = "ko",
+    corpora: Optional[Dict[Tuple, HybridIndex]] = None,
+    search_backend: str = DEFAULT_SEARCH_BACKEND,
+) -> Optional[HybridIndex]:
+
+    # 찬성/반대/심판이 하나의 코퍼스를 공유하므로 키에 역할을 포함하지 않음
+    key = (normalize_topic(topic), language, search_backend)
+
+    # 토론 내에서 이미 사용한 인덱스는 캐시 만료/교체와 관계없이 재사용
+    if corpora is not None and key in corpora:
+        return corpora[key]
+
+    index = await corpus_cache.get_or_create(
+        key, lambda: load_or_build_topic_index(key, topic, language, search_backend)
+    )
+
+    if corpora is not None and index is not None:
+        corpora[key] = index
+    return index
+
+
+async def search_topic(
+    topic: str,
+    role: str,
+    query: str,
+    k: int = 5,
+    corpora: Optional[Dict[Tuple, HybridIndex]] = None,
+    search_backend: str = DEFAULT_SEARCH_BACKEND,
+) -> List[Document]:
+    return await search_topic_queries(
+        topic, role, [query], k=k, corpora=corpora, search_backend=search_backend
+    )
+
+
+async def search_topic_queries(
+    topic: str,
+    role: str,
+    queries: List[str],
+    k: int = 5,
+    corpora: Optional[Dict[Tuple, HybridIndex]] = None,
+    search_backend: str = DEFAULT_SEARCH_BACKEND,
+) -> List[Document]:
+    # 캐시된 검색 인덱스 조회 (없으면 문서를 검색해서 생성)
+    # 역할과 관계없이 토론의 공유 코퍼스를 사용하고, 역할은 검색 필터로만 사용
+    index = await get_topic_index(topic, corpora=corpora, search_backend=search_backend)
+    if not index:
         return []
     try:
-        # 벡터 스토어에서 Similarity Search 수행
-        return vector_store.similarity_search(query, k=k)
+        # 모든 검색어를 한 번에 BM25 + 벡터 검색 후 하나의 순위로 결합
+        return await index.search_many(
+            queries,
+            k=k,
+            fetch_k=settings.HYBRID_FETCH_K,
+            rerank=settings.RERANK_ENABLED,
+            roles=[role] if role else None,
+        )
     except Exception as e:
         st.error(f"검색 중 오류 발생: {str(e)}")
         return []
@@ -1,40 +1,253 @@
-from fastapi import APIRouter, Depends, HTTPException
+import base64
+import binascii
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import String, or_, text, type_coerce
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple
 
 from db.database import get_db
+from db.preview import summarize_messages
+from db.debate_writer import RUNNING
+from db.turns import docs_json, document_rows, message_rows, messages_json
 from server.db.models import Debate as DebateModel
-from server.db.schemas import DebateSchema, DebateCreate
+from server.db.models import DebateDocument, DebateMessage
+from server.db.schemas import (
+    DebateCreate,
+    DebateDocumentSchema,
+    DebatePage,
+    DebateSchema,
+    DebateSearchResult,
+    DebateTurnSchema,
+)
 
 router = APIRouter(prefix="/api/v1", tags=["debates"])
 
 
-# 토론 목록 조회
-@router.get("/debates/", response_model=List[DebateSchema])
-def read_debates(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    debates = db.query(DebateModel).offset(skip).limit(limit).all()
-    return debates
+# 커서 비교에는 DB에 저장된 created_at 문자열을 그대로 사용
+# (DateTime 파라미터로 바인딩하면 SQLite 저장 형식과 달라 같은 시각이 같지 않게 비교됨)
+CREATED_AT_KEY = type_coerce(DebateModel.created_at, String)
+
+
+def encode_cursor(created_at: str, debate_id: int) -> str:
+    payload = json.dumps([created_at, debate_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        created_at, debate_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return str(created_at), int(debate_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# 토론 목록 조회 - 최신순 키셋 페이지네이션 (created_at, id 복합 인덱스 사용)
+# 목록에 필요한 컬럼만 조회 (messages/docs 본문은 읽지 않음)
+@router.get("/debates/", response_model=DebatePage)
+def read_debates(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    query = db.query(
+        DebateModel.id,
+        DebateModel.topic,
+        DebateModel.rounds,
+        DebateModel.created_at,
+        DebateModel.preview,
+        DebateModel.message_count,
+        DebateModel.status,
+        CREATED_AT_KEY.label("created_at_key"),
+    )
+
+    # 이전 페이지 마지막 항목보다 오래된 항목부터 조회 (OFFSET 없이 인덱스 탐색)
+    # created_at <= ? 상한을 따로 두어야 SQLite가 OR 조건에서도 인덱스 범위 검색을 사용
+    if cursor:
+        created_at, debate_id = decode_cursor(cursor)
+        query = query.filter(
+            CREATED_AT_KEY <= created_at,
+            or_(CREATED_AT_KEY < created_at, DebateModel.id < debate_id),
+        )
+
+    # 다음 페이지 존재 여부 확인을 위해 하나 더 조회
+    rows = (
+        query.order_by(DebateModel.created_at.desc(), DebateModel.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last.created_at_key, last.id)
+
+    return {"items": rows[:limit], "next_cursor": next_cursor}
 
 
 # 토론 생성
 @router.post("/debates/", response_model=DebateSchema)
 def create_debate(debate: DebateCreate, db: Session = Depends(get_db)):
-    db_debate = DebateModel(**debate.model_dump())
+    # 목록용 미리보기/발언 수는 저장 시점에 계산
+    preview, message_count = summarize_messages(debate.messages)
+    db_debate = DebateModel(
+        **debate.model_dump(), preview=preview, message_count=message_count
+    )
     db.add(db_debate)
+    db.flush()
+
+    # 발언/참고 자료를 정규화 테이블에도 저장 (발언 단위 조회용)
+    db.add_all(
+        DebateMessage(debate_id=db_debate.id, **row)
+        for row in message_rows(debate.messages)
+    )
+    db.add_all(
+        DebateDocument(debate_id=db_debate.id, **row)
+        for row in document_rows(debate.docs)
+    )
     db.commit()
     db.refresh(db_debate)
     return db_debate
 
 
+# trigram 토크나이저는 3글자 이상부터 색인 검색 가능 (더 짧으면 단어 접두사 색인으로 검색)
+MIN_MATCH_LENGTH = 3
+
+# 관련도 순위를 매길 후보 수 - 일치하는 토론 중 최신 N건만 BM25 로 정렬
+# (흔한 검색어도 일치 건수와 관계없이 일정한 시간 안에 응답)
+SEARCH_CANDIDATES = 1000
+
+SEARCH_COLUMNS = """
+    d.id, d.topic, d.rounds, d.created_at, d.preview, d.message_count, d.status
+"""
+
+# 최신 후보 N건의 시작 rowid(= 토론 ID) - FTS5 는 rowid 역순 조회를 LIMIT 만큼만 읽음
+CANDIDATE_FLOOR = """
+    SELECT min(rowid) FROM (
+        SELECT rowid FROM {table} WHERE {table} MATCH :query
+        ORDER BY rowid DESC LIMIT :candidates
+    )
+"""
+
+# 주제 일치에 가중치를 두어 BM25 관련도 순으로 정렬
+MATCH_QUERY = text(
+    f"""
+    SELECT {SEARCH_COLUMNS},
+        snippet(debates_fts, -1, '**', '**', '…', 24) AS snippet,
+        bm25(debates_fts, 10.0, 1.0) AS score
+    FROM debates_fts JOIN debates d ON d.id = debates_fts.rowid
+    WHERE debates_fts MATCH :query
+        AND debates_fts.rowid >= ({CANDIDATE_FLOOR.format(table="debates_fts")})
+    ORDER BY score
+    LIMIT :limit
+    """
+)
+
+# 짧은 검색어 - 단어 접두사 일치 (본문을 저장하지 않으므로 발췌 대신 미리보기 사용)
+PREFIX_QUERY = text(
+    f"""
+    SELECT {SEARCH_COLUMNS}, d.preview AS snippet,
+        bm25(debates_fts_prefix, 10.0, 1.0) AS score
+    FROM debates_fts_prefix JOIN debates d ON d.id = debates_fts_prefix.rowid
+    WHERE debates_fts_prefix MATCH :query
+        AND debates_fts_prefix.rowid >= ({CANDIDATE_FLOOR.format(table="debates_fts_prefix")})
+    ORDER BY score
+    LIMIT :limit
+    """
+)
+
+
+# 토론 검색 - 주제와 발언 내용 전문 검색 (FTS5)
+@router.get("/debates/search", response_model=List[DebateSearchResult])
+def search_debates(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="Search query must not be blank")
+
+    # 검색어 전체를 하나의 구문으로 검색 (FTS 연산자 문법 해석 방지)
+    phrase = '"' + q.replace('"', '""') + '"'
+    params = {"limit": limit, "candidates": SEARCH_CANDIDATES}
+    try:
+        if len(q) >= MIN_MATCH_LENGTH:
+            rows = db.execute(MATCH_QUERY, {**params, "query": phrase})
+        else:
+            # 공백/문장부호로 구분된 단어 중 검색어로 시작하는 단어가 있는 토론
+            rows = db.execute(PREFIX_QUERY, {**params, "query": phrase + "*"})
+        return rows.mappings().all()
+    except OperationalError:
+        raise HTTPException(status_code=503, detail="Full-text search is not available")
+
+
 # 토론 조회
 @router.get("/debates/{debate_id}", response_model=DebateSchema)
 def read_debate(debate_id: int, db: Session = Depends(get_db)):
     db_debate = db.query(DebateModel).filter(DebateModel.id == debate_id).first()
     if db_debate is None:
         raise HTTPException(status_code=404, detail="Debate not found")
+
+    # 진행 중인 토론은 JSON 을 종료 시에만 기록하므로 지금까지 저장된 발언 행으로 재구성
+    if db_debate.status == RUNNING:
+        turns = (
+            db.query(DebateMessage)
+            .filter(DebateMessage.debate_id == debate_id)
+            .order_by(DebateMessage.seq)
+        )
+        documents = (
+            db.query(DebateDocument)
+            .filter(DebateDocument.debate_id == debate_id)
+            .order_by(DebateDocument.role, DebateDocument.seq)
+        )
+        return DebateSchema.model_validate(db_debate).model_copy(
+            update={"messages": messages_json(turns), "docs": docs_json(documents)}
+        )
+
     return db_debate
 
 
+def get_debate_or_404(db: Session, debate_id: int) -> DebateModel:
+    db_debate = db.query(DebateModel.id).filter(DebateModel.id == debate_id).first()
+    if db_debate is None:
+        raise HTTPException(status_code=404, detail="Debate not found")
+    return db_debate
+
+
+# 토론 발언 조회 - 라운드별 또는 seq 이후부터 나눠서 조회 (전체 messages JSON 을 읽지 않음)
+@router.get("/debates/{debate_id}/turns", response_model=List[DebateTurnSchema])
+def read_debate_turns(
+    debate_id: int,
+    round: Optional[int] = Query(None, ge=1),
+    after_seq: int = Query(-1, ge=-1),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    get_debate_or_404(db, debate_id)
+
+    query = db.query(DebateMessage).filter(
+        DebateMessage.debate_id == debate_id, DebateMessage.seq > after_seq
+    )
+    if round is not None:
+        query = query.filter(DebateMessage.round == round)
+    return query.order_by(DebateMessage.seq).limit(limit).all()
+
+
+# 토론 참고 자료 조회 (역할별)
+@router.get("/debates/{debate_id}/documents", response_model=List[DebateDocumentSchema])
+def read_debate_documents(
+    debate_id: int, role: Optional[str] = None, db: Session = Depends(get_db)
+):
+    get_debate_or_404(db, debate_id)
+
+    query = db.query(DebateDocument).filter(DebateDocument.debate_id == debate_id)
+    if role is not None:
+        query = query.filter(DebateDocument.role == role)
+    return query.order_by(DebateDocument.role, DebateDocument.seq).all()
+
+
 # 토론 삭제
 @router.delete("/debates/{debate_id}")
 def delete_debate(debate_id: int, db: Session = Depends(get_db)):
@@ -42,6 +255,8 @@ def delete_debate(debate_id: int, db: Session = Depends(get_db)):
     if db_debate is None:
         raise HTTPException(status_code=404, detail="Debate not found")
 
+    db.query(DebateMessage).filter(DebateMessage.debate_id == debate_id).delete()
+    db.query(DebateDocument).filter(DebateDocument.debate_id == debate_id).delete()
     db.delete(db_debate)
     db.commit()
     return {"detail": "Debate successfully deleted"}
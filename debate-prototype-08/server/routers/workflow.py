@@ -1,15 +1,33 @@
 from typing import Any
-import uuid
-import json
+from collections import Counter
 import asyncio
-from fastapi import APIRouter
+import logging
+import uuid
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from langfuse.callback import CallbackHandler
 
 
+from db.debate_writer import CANCELLED, COMPLETED, FAILED, DebateWriter
+from retrieval.backends import DEFAULT_SEARCH_BACKEND, SEARCH_BACKENDS
+from retrieval.search_service import query_cache, search_latency
+from retrieval.vector_store import corpus_cache, index_store, preprocessor
+from utils.config import get_embeddings, settings
 from workflow.state import AgentType, DebateState
-from workflow.graph import create_debate_graph
+from workflow.graph import get_debate_graph
+from workflow.events import (
+    FULL_STATE_PROTOCOL,
+    SUPPORTED_PROTOCOL_VERSIONS,
+    create_encoder,
+    format_event,
+)
+from workflow.scheduler import (
+    DebateScheduler,
+    DebateTicket,
+    QueueFullError,
+    QuotaExceededError,
+)
 
 
 # API 경로를 /api/v1로 변경
@@ -19,11 +37,51 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+logger = logging.getLogger(__name__)
+
+# 클라이언트 연결 상태 확인 주기 (초)
+DISCONNECT_POLL_INTERVAL = 0.5
+
+# 토론 실행 결과 집계 (completed / cancelled / failed)
+debate_outcomes: Counter = Counter()
+
+# 진행 중인 토론 최종 저장 태스크 (완료 전 GC 방지)
+finish_tasks: set = set()
+
+# 토론 동시 실행 제한 및 대기열
+scheduler = DebateScheduler(
+    max_concurrent=settings.MAX_CONCURRENT_DEBATES,
+    max_queue=settings.DEBATE_QUEUE_SIZE,
+    max_per_client=settings.MAX_DEBATES_PER_CLIENT,
+    max_per_address=settings.MAX_DEBATES_PER_ADDRESS,
+    trusted_addresses=settings.TRUSTED_CLIENT_ADDRESSES,
+)
+
+
+class DebateStreamingResponse(StreamingResponse):
+    """응답이 어떻게 끝나든 토론 실행 슬롯/할당량 반환
+
+    본문 전송 전에 연결이 끊기면 debate_generator 가 시작되지 않아
+    그 안의 finally 가 실행되지 않으므로 응답 단위로 한 번 더 반환 (release 는 중복 호출 무시)
+    """
+
+    def __init__(self, content, ticket: DebateTicket, **kwargs):
+        super().__init__(content, **kwargs)
+        self.ticket = ticket
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            scheduler.release(self.ticket)
+
 
 class WorkflowRequest(BaseModel):
     topic: str
     max_rounds: int = 3
     enable_rag: bool = True
+    protocol_version: int = FULL_STATE_PROTOCOL  # 스트림 이벤트 프로토콜 버전
+    search_backend: str = DEFAULT_SEARCH_BACKEND  # RAG 검색 백엔드 (duckduckgo / local)
 
 
 class WorkflowResponse(BaseModel):
@@ -31,64 +89,176 @@ class WorkflowResponse(BaseModel):
     result: Any = None
 
 
-async def debate_generator(debate_graph, initial_state, langfuse_handler):
-    # 그래프에서 청크 스트리밍
-    for chunk in debate_graph.stream(
+async def stream_debate_events(debate_graph, initial_state, config, encoder, writer):
+    # 그래프에서 청크 비동기 스트리밍 (이벤트 루프를 블로킹하지 않음)
+    # - updates: 노드 실행 결과 (프로토콜 버전별 인코더가 이벤트로 변환, 발언은 DB에도 저장)
+    # - custom: 에이전트가 생성 중인 토큰 (token 이벤트)
+    async for namespace, mode, chunk in debate_graph.astream(
         initial_state,
-        config={"callbacks": [langfuse_handler]},
+        config=config,
         subgraphs=True,
-        stream_mode="updates",
+        stream_mode=["updates", "custom"],
     ):
         if not chunk:
             continue
 
-        node = chunk[0] if len(chunk) > 0 else None
-        if not node or node == ():
+        if mode == "custom":
+            yield format_event("token", chunk)
             continue
 
-        node_name = node[0]
+        if not namespace:
+            continue
+
+        node_name = namespace[0]
         role = node_name.split(":")[0]
-        subgraph = chunk[1]
-        subgraph_node = subgraph.get("update_state", None)
-
-        if subgraph_node:
-            response = subgraph_node.get("response", None)
-            debate_state = subgraph_node.get("debate_state", None)
-            messages = debate_state.get("messages", [])
-            round = debate_state.get("current_round")
-            max_rounds = debate_state.get("max_rounds")
-            docs = debate_state.get("docs", {})
-            topic = debate_state.get("topic")
-
-            state = {
-                "role": role,
-                "response": response,
-                "topic": topic,
-                "messages": messages,
-                "current_round": round,
-                "max_rounds": max_rounds,
-                "docs": docs,
-            }
-
-            event_data = {"type": "update", "data": state}
-            yield f"data: {json.dumps(event_data, ensure_ascii=False)}\n\n"
-            print(event_data)
-
-            await asyncio.sleep(0.01)
+
+        for subgraph_node, update in chunk.items():
+            if not update:
+                continue
+            writer.observe(role, subgraph_node, update)
+            for event_type, data in encoder.encode_update(role, subgraph_node, update):
+                yield format_event(event_type, data)
+
+    for event_type, data in encoder.encode_end():
+        yield format_event(event_type, data)
 
     # 디베이트 종료 메시지
-    yield f"data: {json.dumps({'type': 'end', 'data': {}}, ensure_ascii=False)}\n\n"
+    yield format_event("end", {})
+
+
+# 클라이언트 연결이 끊기면 토론 실행 태스크 취소
+async def watch_disconnect(request: Request, task: asyncio.Task):
+    while not task.done():
+        if await request.is_disconnected():
+            task.cancel()
+            return
+        await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+
+
+async def debate_generator(
+    events,
+    writer: DebateWriter,
+    request: Request,
+    session_id: str,
+    ticket: DebateTicket,
+):
+    try:
+        # 실행 차례가 될 때까지 대기 순번 전송
+        last_position = None
+        async for position in scheduler.wait(ticket, DISCONNECT_POLL_INTERVAL):
+            if await request.is_disconnected():
+                debate_outcomes[CANCELLED] += 1
+                logger.info("debate %s cancelled while queued", session_id)
+                return
+
+            if position != last_position:
+                last_position = position
+                yield format_event("queued", {"position": position})
+
+        async for event in run_debate(events, writer, request, session_id):
+            yield event
+    finally:
+        scheduler.release(ticket)
+
+
+async def run_debate(events, writer: DebateWriter, request: Request, session_id: str):
+    # 실행 시작 시 토론을 DB에 만들고 ID 전달 (이후 발언은 진행 중에 서버에서 저장)
+    # 저장에 실패해도 토론 스트리밍은 계속 진행
+    try:
+        debate_id = await writer.start()
+        yield format_event("debate", {"debate_id": debate_id})
+    except Exception:
+        logger.exception("debate %s could not be persisted", session_id)
+
+    # 토론은 별도 태스크에서 실행하고, 생성된 이벤트는 큐를 통해 전달
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            async for event in events:
+                await queue.put(event)
+        except Exception:
+            # 실패를 클라이언트에 알리고 (end 이벤트 없이 종료) 실행 결과는 실패로 기록
+            queue.put_nowait(format_event("error", {"message": "Debate failed"}))
+            raise
+        finally:
+            await events.aclose()
+            queue.put_nowait(None)
+
+    # 토론 실행 결과 기록
+    def record_outcome(task: asyncio.Task):
+        if task.cancelled():
+            outcome = CANCELLED
+        elif task.exception() is not None:
+            outcome = FAILED
+            logger.error("debate %s failed", session_id, exc_info=task.exception())
+        else:
+            outcome = COMPLETED
+        debate_outcomes[outcome] += 1
+        logger.info("debate %s %s", session_id, outcome)
+
+        # 남은 발언 저장 및 최종 상태 기록 (중단된 토론도 그때까지의 발언은 조회 가능)
+        finish_task = asyncio.create_task(writer.finish(outcome))
+        finish_tasks.add(finish_task)
+        finish_task.add_done_callback(finish_tasks.discard)
+
+    producer = asyncio.create_task(produce())
+    producer.add_done_callback(record_outcome)
+    watcher = asyncio.create_task(watch_disconnect(request, producer))
+
+    try:
+        while (event := await queue.get()) is not None:
+            yield event
+    finally:
+        # 스트림이 중단된 경우에도 진행 중인 LLM 호출과 검색을 모두 취소
+        producer.cancel()
+        watcher.cancel()
+
+
+# 토론 스케줄러 상태 조회
+@router.get("/debate/stats")
+async def read_debate_stats():
+    return {**scheduler.stats(), "outcomes": dict(debate_outcomes)}
+
+
+# 검색 코퍼스/임베딩 캐시 상태 및 웹 검색 지연 시간 조회
+@router.get("/retrieval/stats")
+async def read_retrieval_stats():
+    return {
+        "corpus": corpus_cache.stats(),
+        "query_rewrites": query_cache.stats(),
+        "preprocess": preprocessor.stats(),
+        "index_store": await asyncio.to_thread(index_store.stats),
+        "embeddings": await asyncio.to_thread(get_embeddings().stats),
+        "search": search_latency.snapshot(),
+    }
 
 
 # 엔드포인트 경로 수정 (/debate/stream -> 유지)
 @router.post("/debate/stream")
-async def stream_debate_workflow(request: WorkflowRequest):
+async def stream_debate_workflow(request: WorkflowRequest, http_request: Request):
     topic = request.topic
     max_rounds = request.max_rounds
     enable_rag = request.enable_rag
 
+    if request.protocol_version not in SUPPORTED_PROTOCOL_VERSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported protocol_version: {request.protocol_version}",
+        )
+
+    if request.search_backend not in SEARCH_BACKENDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported search_backend: {request.search_backend}",
+        )
+
+    # 클라이언트 식별 - 할당량은 접속 주소 기준, X-Client-Id 는 같은 주소 안의 구분용
+    address = http_request.client.host if http_request.client else "unknown"
+    client_id = http_request.headers.get("X-Client-Id", "")
+
     session_id = str(uuid.uuid4())
-    debate_graph = create_debate_graph(enable_rag, session_id)
+    debate_graph = get_debate_graph(enable_rag)
 
     initial_state: DebateState = {
         "topic": topic,
@@ -97,12 +267,56 @@ async def stream_debate_workflow(request: WorkflowRequest):
         "max_rounds": max_rounds,
         "prev_node": "START",  # 이전 노드 START로 설정
         "docs": {},  # RAG 결과 저장
+        "history_summary": "",
+        "summarized_count": 0,
+        "transcript": "",
+        "transcript_count": 0,
+        "token_usage": [],
+    }
+
+    # 요청별 값은 캐시된 그래프에 실행 config로 전달
+    config = {
+        "callbacks": [CallbackHandler(session_id=session_id)],
+        "configurable": {
+            "session_id": session_id,
+            "corpora": {},  # 이 토론에서 사용한 벡터 스토어
+            "search_backend": request.search_backend,
+        },
     }
 
-    langfuse_handler = CallbackHandler(session_id=session_id)
+    # 진행 중 발언을 모아서 저장 (write-behind)
+    writer = DebateWriter(
+        topic,
+        max_rounds,
+        batch_size=settings.PERSIST_BATCH_TURNS,
+        flush_interval=settings.PERSIST_FLUSH_INTERVAL,
+    )
+
+    # 동시 실행 제한 - 할당량 초과 또는 대기열 포화 시 즉시 거절
+    try:
+        ticket = scheduler.submit(address, client_id)
+    except QuotaExceededError:
+        raise HTTPException(
+            status_code=429, detail="Too many debates in progress for this client"
+        )
+    except QueueFullError:
+        raise HTTPException(status_code=503, detail="Debate queue is full")
 
     # 스트리밍 응답 반환
-    return StreamingResponse(
-        debate_generator(debate_graph, initial_state, langfuse_handler),
+    return DebateStreamingResponse(
+        debate_generator(
+            stream_debate_events(
+                debate_graph,
+                initial_state,
+                config,
+                create_encoder(request.protocol_version),
+                writer,
+            ),
+            writer,
+            http_request,
+            session_id,
+            ticket,
+        ),
+        ticket=ticket,
         media_type="text/event-stream",
     )
@@ -1,7 +1,12 @@
 import os
+import threading
+from typing import Dict, List, Literal
+import httpx
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
+from utils.embedding_cache import CachedEmbeddings
+from utils.sqlite_store import SQLiteStore
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
@@ -30,9 +35,97 @@ class Settings(BaseSettings):
     DB_PATH: str = "history.db"
     SQLALCHEMY_DATABASE_URI: str = f"sqlite:///./{DB_PATH}"
 
+    # LLM HTTP 연결 풀 설정 (sync/async 클라이언트 각각 적용)
+    LLM_MAX_CONNECTIONS: int = 100  # 최대 동시 연결 수
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 20  # 유지할 유휴 연결 수
+    LLM_KEEPALIVE_EXPIRY: float = 60.0  # 유휴 연결 유지 시간(초)
+    LLM_TIMEOUT: float = 60.0  # 요청 타임아웃(초)
+    LLM_CONNECT_TIMEOUT: float = 10.0  # 연결 타임아웃(초)
+    LLM_MAX_RETRIES: int = 2
+
+    # 임베딩 디스크 캐시 설정 (history.db와 같은 위치에 저장)
+    EMBEDDING_CACHE_PATH: str = "embedding_cache.db"
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 200_000  # 최대 저장 벡터 수
+    EMBEDDING_CACHE_MAX_AGE: int = 30 * 24 * 3600  # 마지막 사용 후 보관 기간(초)
+
+    # 웹 검색 설정
+    SEARCH_MAX_CONCURRENCY: int = 8  # 프로세스 전체 동시 검색 수
+    SEARCH_TIMEOUT: float = 8.0  # 검색어별 타임아웃(초)
+    SEARCH_DEADLINE: float = 10.0  # 검색어 전체 마감 시간(초), 이후 끝난 결과만 사용
+
+    # 검색어 개선 결과 캐시 설정 (메모리 LRU + SQLite)
+    QUERY_CACHE_PATH: str = "query_cache.db"
+    QUERY_CACHE_SIZE: int = 1024  # 메모리에 캐시할 최대 주제 수 (LRU)
+    QUERY_CACHE_TTL: int = 7 * 24 * 3600  # 검색어 유효 기간(초)
+    QUERY_CACHE_MAX_ENTRIES: int = 50_000  # SQLite에 저장할 최대 항목 수
+    # 찬성/반대/심판 검색어를 한 번의 LLM 호출로 함께 생성
+    BATCH_QUERY_REWRITE: bool = True
+
+    # 로컬 검색 백엔드가 색인할 문서 디렉토리 (JSONL / Markdown)
+    LOCAL_CORPUS_DIR: str = "corpus"
+
+    # 색인 전 문서 전처리 설정
+    CHUNK_SIZE: int = 800  # 청크 최대 길이(문자)
+    CHUNK_OVERLAP: int = 100  # 인접 청크 간 겹치는 길이(문자)
+    NEAR_DUPLICATE_DISTANCE: int = 6  # 유사 문서로 볼 SimHash 최대 비트 차이
+
+    # 하이브리드 검색 설정 (BM25 + 벡터, RRF 결합)
+    HYBRID_FETCH_K: int = 20  # 검색 방식별로 결합 전에 가져올 후보 수
+    RERANK_ENABLED: bool = False  # 결합된 후보를 로컬 재정렬기로 다시 정렬
+
+    # 검색 코퍼스 캐시 설정
+    CORPUS_CACHE_SIZE: int = 128  # 캐시할 최대 벡터 스토어 수 (LRU)
+    CORPUS_CACHE_TTL: int = 3600  # 캐시 유효 시간(초)
+
+    # 검색 인덱스 디스크 캐시 설정 (재시작/워커 간 공유)
+    INDEX_CACHE_DIR: str = "index_cache"
+    INDEX_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024  # 전체 디스크 사용량 제한
+    INDEX_CACHE_MAX_AGE: int = 24 * 3600  # 저장 후 유효 기간(초)
+
+    # 에이전트에 전달할 대화 기록 설정
+    # full: 전체 기록 / window: 최근 N개 발언 / summary: 요약 + 최근 N개 발언
+    HISTORY_STRATEGY: Literal["full", "window", "summary"] = "summary"
+    HISTORY_WINDOW_TURNS: int = 4  # 원문 그대로 전달할 최근 발언 수
+    TOKEN_ENCODING: str = "o200k_base"  # gpt-4o 토크나이저
+
+    # 프롬프트 토큰 예산 설정
+    PROMPT_TOKEN_BUDGET: int = 6000  # 에이전트 프롬프트 전체 토큰 예산
+    # 시스템 프롬프트/지시문을 뺀 나머지 중 검색 컨텍스트 비율 (나머지는 대화 기록)
+    # 심판은 나머지 예산을 프롬프트에 포함하는 토론 기록에 사용
+    CONTEXT_TOKEN_SHARE: Dict[str, float] = {
+        "PRO_AGENT": 0.5,
+        "CON_AGENT": 0.5,
+        "JUDGE_AGENT": 0.3,
+    }
+
+    # 스트리밍 중 토론 저장 설정 (write-behind)
+    PERSIST_BATCH_TURNS: int = 3  # 이 개수만큼 발언이 모이면 바로 커밋
+    PERSIST_FLUSH_INTERVAL: float = 2.0  # 발언이 덜 모여도 이 시간(초) 뒤에 커밋
+
+    # 토론 스케줄러 설정
+    MAX_CONCURRENT_DEBATES: int = 8  # 동시에 실행할 수 있는 최대 토론 수
+    DEBATE_QUEUE_SIZE: int = 32  # 실행 대기열 최대 길이
+    MAX_DEBATES_PER_CLIENT: int = 2  # 클라이언트별(접속 주소 + X-Client-Id) 대기 + 실행 중 토론 수 제한
+    MAX_DEBATES_PER_ADDRESS: int = 4  # 접속 주소별 대기 + 실행 중 토론 수 제한
+    # 주소 단위 제한을 적용하지 않는 프런트엔드 주소 (여러 사용자의 요청을 대신 보내는 Streamlit 서버 등)
+    TRUSTED_CLIENT_ADDRESSES: List[str] = []
+
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
-    def get_llm(self):
+    def get_http_clients(self):
+        """연결 풀 설정이 적용된 sync/async HTTP 클라이언트를 생성합니다."""
+        limits = httpx.Limits(
+            max_connections=self.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=self.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=self.LLM_KEEPALIVE_EXPIRY,
+        )
+        timeout = httpx.Timeout(self.LLM_TIMEOUT, connect=self.LLM_CONNECT_TIMEOUT)
+        return (
+            httpx.Client(limits=limits, timeout=timeout),
+            httpx.AsyncClient(limits=limits, timeout=timeout),
+        )
+
+    def get_llm(self, http_client=None, http_async_client=None):
         """Azure OpenAI LLM 인스턴스를 반환합니다."""
         return AzureChatOpenAI(
             openai_api_key=self.AOAI_API_KEY,
@@ -41,26 +134,86 @@ class Settings(BaseSettings):
             api_version=self.AOAI_API_VERSION,
             temperature=0.7,
             streaming=True,  # 스트리밍 활성화
+            timeout=self.LLM_TIMEOUT,
+            max_retries=self.LLM_MAX_RETRIES,
+            http_client=http_client,
+            http_async_client=http_async_client,
         )
 
-    def get_embeddings(self):
+    def get_embeddings(self, http_client=None, http_async_client=None):
         """Azure OpenAI Embeddings 인스턴스를 반환합니다."""
         return AzureOpenAIEmbeddings(
             model=self.AOAI_EMBEDDING_DEPLOYMENT,
             openai_api_version=self.AOAI_API_VERSION,
             api_key=self.AOAI_API_KEY,
             azure_endpoint=self.AOAI_ENDPOINT,
+            timeout=self.LLM_TIMEOUT,
+            max_retries=self.LLM_MAX_RETRIES,
+            http_client=http_client,
+            http_async_client=http_async_client,
         )
 
 
+# 모든 에이전트 호출이 같은 HTTP 연결 풀을 공유하여
+# 호출마다 새 연결(TLS 핸드셰이크)을 맺지 않도록 함
+class ClientRegistry:
+    """프로세스 전역 LLM/Embeddings 클라이언트 저장소"""
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._clients = {}
+
+    def _get(self, name: str, factory):
+        with self._lock:
+            if name not in self._clients:
+                self._clients[name] = factory()
+            return self._clients[name]
+
+    def _http_clients(self):
+        return self._get("http", self.settings.get_http_clients)
+
+    def get_llm(self):
+        return self._get("llm", lambda: self.settings.get_llm(*self._http_clients()))
+
+    def get_embeddings(self):
+        return self._get("embeddings", self._create_cached_embeddings)
+
+    # 임베딩 결과를 디스크에 캐시하여 같은 텍스트는 다시 임베딩하지 않음
+    def _create_cached_embeddings(self):
+        store = SQLiteStore(
+            self.settings.EMBEDDING_CACHE_PATH,
+            table="embeddings",
+            max_entries=self.settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            max_age=self.settings.EMBEDDING_CACHE_MAX_AGE,
+        )
+        return CachedEmbeddings(
+            self.settings.get_embeddings(*self._http_clients()),
+            store,
+            namespace=self.settings.AOAI_EMBEDDING_DEPLOYMENT,
+        )
+
+    async def aclose(self):
+        """공유 HTTP 연결 풀 종료 (서버 종료 시 호출)"""
+        with self._lock:
+            clients = self._clients
+            self._clients = {}
+
+        if "http" in clients:
+            http_client, http_async_client = clients["http"]
+            http_client.close()
+            await http_async_client.aclose()
+
+
 # 설정 인스턴스 생성
 settings = Settings()
+clients = ClientRegistry(settings)
 
 
-# 편의를 위한 함수들, 하위 호환성을 위해 유지
+# 편의를 위한 함수들, 하위 호환성을 위해 유지 (공유 클라이언트 반환)
 def get_llm():
-    return settings.get_llm()
+    return clients.get_llm()
 
 
 def get_embeddings():
-    return settings.get_embeddings()
+    return clients.get_embeddings()
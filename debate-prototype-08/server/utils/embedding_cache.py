@@ -0,0 +1,85 @@
+# 임베딩 결과 디스크 캐시 - 같은 텍스트는 다시 임베딩하지 않음
+import asyncio
+import hashlib
+from array import array
+from typing import Dict, List
+
+from langchain_core.embeddings import Embeddings
+
+from utils.sqlite_store import SQLiteStore
+
+
+def _encode(vector: List[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _decode(value: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(value)
+    return vector.tolist()
+
+
+class CachedEmbeddings(Embeddings):
+    """텍스트 내용 해시를 키로 임베딩 결과를 SQLite에 캐시하는 래퍼"""
+
+    def __init__(self, embeddings: Embeddings, store: SQLiteStore, namespace: str):
+        self.embeddings = embeddings
+        self.store = store
+        self.namespace = namespace  # 임베딩 모델 구분 (모델이 바뀌면 캐시 분리)
+
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.namespace}\0{text}".encode("utf-8")).hexdigest()
+
+    # 캐시에서 찾은 벡터와 임베딩이 필요한 텍스트 분리
+    def _lookup(self, texts: List[str]):
+        keys = [self._key(text) for text in texts]
+        found = self.store.mget(keys)
+
+        vectors: Dict[str, List[float]] = {
+            key: _decode(value) for key, value in found.items()
+        }
+        missing = list(dict.fromkeys(t for t, k in zip(texts, keys) if k not in found))
+
+        self.hits += len(texts) - sum(1 for k in keys if k not in found)
+        self.misses += len(missing)
+        return keys, vectors, missing
+
+    def _store(self, missing: List[str], embedded: List[List[float]], vectors: Dict):
+        items = {}
+        for text, vector in zip(missing, embedded):
+            key = self._key(text)
+            vectors[key] = vector
+            items[key] = _encode(vector)
+        self.store.mset(items)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, vectors, missing = self._lookup(texts)
+        if missing:
+            self._store(missing, self.embeddings.embed_documents(missing), vectors)
+        return [vectors[key] for key in keys]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        # SQLite 조회/저장은 스레드에서 실행하여 이벤트 루프를 막지 않음
+        keys, vectors, missing = await asyncio.to_thread(self._lookup, texts)
+        if missing:
+            embedded = await self.embeddings.aembed_documents(missing)
+            await asyncio.to_thread(self._store, missing, embedded, vectors)
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": self.store.count(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,37 @@
+# 간단한 지연 시간 히스토그램 (Prometheus 스타일 누적 버킷)
+import bisect
+from collections import Counter
+from typing import Sequence
+
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0)
+
+
+class LatencyHistogram:
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.outcomes: Counter = Counter()  # ok / timeout / error 등 결과별 횟수
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float, outcome: str = "ok"):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.outcomes[outcome] += 1
+        self.count += 1
+        self.total += seconds
+
+    def snapshot(self) -> dict:
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "avg": round(self.total / self.count, 3) if self.count else 0.0,
+            "buckets": buckets,
+            "outcomes": dict(self.outcomes),
+        }
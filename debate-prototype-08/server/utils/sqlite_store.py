@@ -0,0 +1,130 @@
+# SQLite 기반 키-값 캐시 저장소 - 배치 조회, 개수/기간 기반 정리
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+# SQLite 바인딩 변수 개수 제한을 넘지 않도록 나눠서 조회
+BATCH_SIZE = 500
+
+
+class SQLiteStore:
+
+    def __init__(
+        self,
+        path: str,
+        table: str,
+        max_entries: Optional[int] = None,
+        max_age: Optional[float] = None,
+        ttl: Optional[float] = None,
+        evict_every: int = 1000,
+    ):
+        self.table = table
+        self.max_entries = max_entries  # 최대 저장 항목 수
+        self.max_age = max_age  # 마지막 사용 후 보관 기간(초)
+        self.ttl = ttl  # 저장 후 유효 기간(초), 지난 항목은 조회되지 않음
+        self.evict_every = evict_every  # 이 횟수만큼 저장할 때마다 정리
+
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        # 여러 uvicorn 워커가 같은 파일을 공유할 수 있도록 WAL 모드 사용
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_last_used ON {table} (last_used)"
+        )
+        self._conn.commit()
+
+    def mget(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """여러 키를 한 번에 조회 (조회된 항목은 마지막 사용 시각 갱신)"""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, bytes] = {}
+        now = time.time()
+        created_after = now - self.ttl if self.ttl is not None else 0
+
+        with self._lock:
+            for i in range(0, len(keys), BATCH_SIZE):
+                batch = keys[i : i + BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM {self.table} "
+                    f"WHERE key IN ({placeholders}) AND created_at >= ?",
+                    [*batch, created_after],
+                ).fetchall()
+                found.update(rows)
+
+            if found:
+                self._conn.executemany(
+                    f"UPDATE {self.table} SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+
+        return found
+
+    def mset(self, items: Dict[str, bytes]):
+        """여러 항목을 한 번에 저장"""
+        if not items:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, value, now, now) for key, value in items.items()],
+            )
+            self._conn.commit()
+
+            self._writes += len(items)
+            if self._writes >= self.evict_every:
+                self._writes = 0
+                self._evict()
+
+    def evict(self):
+        """오래되었거나 개수 제한을 넘는 항목 정리"""
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        if self.ttl is not None:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?",
+                (time.time() - self.ttl,),
+            )
+
+        if self.max_age is not None:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE last_used < ?",
+                (time.time() - self.max_age,),
+            )
+
+        if self.max_entries is not None:
+            # 가장 오랫동안 사용되지 않은 항목부터 삭제
+            self._conn.execute(
+                f"""
+                DELETE FROM {self.table} WHERE key IN (
+                    SELECT key FROM {self.table}
+                    ORDER BY last_used DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+        self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
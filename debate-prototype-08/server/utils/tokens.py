@@ -0,0 +1,37 @@
+# 토큰 수 계산 (tiktoken) - 프롬프트/응답 토큰 집계용
+from functools import lru_cache
+from typing import List
+
+import tiktoken
+from langchain_core.messages import BaseMessage
+
+from utils.config import settings
+
+# 채팅 형식의 메시지당 추가 토큰 (역할/구분자) 및 응답 시작 토큰
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+
+@lru_cache(maxsize=None)
+def get_encoding(name: str = settings.TOKEN_ENCODING) -> tiktoken.Encoding:
+    return tiktoken.get_encoding(name)
+
+
+def count_tokens(text: str) -> int:
+    return len(get_encoding().encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: List[BaseMessage]) -> int:
+    """LLM에 전달할 메시지 목록의 프롬프트 토큰 수"""
+    return (
+        sum(TOKENS_PER_MESSAGE + count_tokens(message.content) for message in messages)
+        + TOKENS_PER_REPLY
+    )
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """앞에서부터 최대 max_tokens 토큰까지만 남김"""
+    tokens = get_encoding().encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return get_encoding().decode(tokens[:max_tokens])
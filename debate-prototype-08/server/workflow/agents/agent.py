@@ -1,11 +1,17 @@
-from langchain.schema import HumanMessage, SystemMessage, AIMessage
-from retrieval.vector_store import search_topic
-from utils.config import get_llm
+from langchain.schema import Document, HumanMessage, SystemMessage, AIMessage
+from retrieval.backends import DEFAULT_SEARCH_BACKEND
+from retrieval.vector_store import search_topic_queries
+from utils.config import get_llm, settings
+from utils.tokens import TOKENS_PER_MESSAGE, count_message_tokens, count_tokens
+from workflow.history import extend_transcript, select_history
+from workflow.token_budget import TokenBudget, fit_documents, fit_history
 from workflow.state import DebateState, AgentType
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, TypedDict
+from typing import List, Dict, Any, Tuple, TypedDict
 from langchain_core.messages import BaseMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
+from langgraph.types import StreamWriter
 from langfuse.callback import CallbackHandler
 
 
@@ -13,23 +19,32 @@ from langfuse.callback import CallbackHandler
 class AgentState(TypedDict):
 
     debate_state: Dict[str, Any]  # 전체 토론 상태
+    documents: List[Document]  # 검색된 문서 (관련도 순)
     context: str  # 검색된 컨텍스트
     messages: List[BaseMessage]  # LLM에 전달할 메시지
+    usage: Dict[str, Any]  # 발언의 토큰 사용량 (구성 요소별)
     response: str  # LLM 응답
 
 
+# 역할별 프롬프트 토큰 예산
+token_budget = TokenBudget(
+    total=settings.PROMPT_TOKEN_BUDGET, context_shares=settings.CONTEXT_TOKEN_SHARE
+)
+
+
 # 에이전트 추상 클래스 정의
 class Agent(ABC):
 
+    # 대화 기록을 채팅 메시지로 전달할지 여부
+    # (False 이면 대화 기록 예산으로 _fit_debate_record 의 토론 기록을 프롬프트에 직접 포함)
+    include_history = True
+
     #
-    def __init__(
-        self, system_prompt: str, role: str, k: int = 2, session_id: str = None
-    ):
+    def __init__(self, system_prompt: str, role: str, k: int = 2):
         self.system_prompt = system_prompt
         self.role = role
         self.k = k  # 검색할 문서 개수
         self._setup_graph()  # 그래프 설정
-        self.session_id = session_id  # langfuse 세션 ID
 
     def _setup_graph(self):
         # 그래프 생성
@@ -53,16 +68,44 @@ class Agent(ABC):
         self.graph = workflow.compile()
 
     # 자료 검색
-    def _retrieve_context(self, state: AgentState) -> AgentState:
+    async def _retrieve_context(
+        self, state: AgentState, config: RunnableConfig
+    ) -> AgentState:
 
         # k=0이면 검색 비활성화
         if self.k <= 0:
-            return {**state, "context": ""}
+            return {**state, "documents": []}
 
         debate_state = state["debate_state"]
         topic = debate_state["topic"]
 
-        # 검색 쿼리 생성
+        # 검색 쿼리 생성 - 역할 관점 검색어 + 직전 상대 발언에 대한 검색어
+        queries = self._build_queries(debate_state)
+
+        # RAG 서비스를 통해 모든 검색어를 한 번에 검색 - 토론별 코퍼스 저장소를 넘겨
+        # 한 토론의 공유 인덱스는 최대 한 번만 생성되도록 함
+        # (찬성/반대는 자기 측이 수집한 문서만, 심판은 양측 문서 전체에서 검색)
+        configurable = config.get("configurable", {})
+        docs = await search_topic_queries(
+            topic,
+            None if self.role == AgentType.JUDGE else self.role,
+            queries,
+            k=self.k,
+            corpora=configurable.get("corpora"),
+            search_backend=configurable.get("search_backend", DEFAULT_SEARCH_BACKEND),
+        )
+
+        debate_state["docs"][self.role] = (
+            [doc.page_content for doc in docs] if docs else []
+        )
+
+        # 상태 업데이트 (컨텍스트는 토큰 예산에 맞춰 메시지 준비 단계에서 구성)
+        return {**state, "documents": docs or []}
+
+    # 에이전트의 검색어 목록 생성
+    def _build_queries(self, debate_state: Dict[str, Any]) -> List[str]:
+
+        topic = debate_state["topic"]
         query = topic
         if self.role == AgentType.PRO:
             query += " 찬성 장점 이유 근거"
@@ -70,44 +113,66 @@ class Agent(ABC):
             query += " 반대 단점 이유 근거"
         elif self.role == AgentType.JUDGE:
             query += " 평가 기준 객관적 사실"
+        queries = [query]
 
-        # RAG 서비스를 통해 검색 실행
-        docs = search_topic(topic, self.role, query, k=self.k)  # noqa: F821
+        # 상대 측 마지막 발언 내용과 관련된 자료도 함께 검색 (반박 근거)
+        for message in reversed(debate_state["messages"]):
+            if message["role"] != self.role:
+                queries.append(f"{topic} {message['content'][:200]}")
+                break
 
-        debate_state["docs"][self.role] = (
-            [doc.page_content for doc in docs] if docs else []
-        )
+        return queries
 
-        # 컨텍스트 포맷팅
-        context = self._format_context(docs)
+    # 검색 결과 문서 하나를 Context 형식으로 변환
+    def _format_document(self, i: int, doc: Document) -> str:
 
-        # 상태 업데이트
-        return {**state, "context": context}
-
-    # 검색 결과로 Context 생성
-    def _format_context(self, docs: list) -> str:
-
-        context = ""
-        for i, doc in enumerate(docs):
-            source = doc.metadata.get("source", "Unknown")
-            section = doc.metadata.get("section", "")
-            context += f"[문서 {i + 1}] 출처: {source}"
-            if section:
-                context += f", 섹션: {section}"
-            context += f"\n{doc.page_content}\n\n"
-        return context
-
-    # 프롬프트 메시지 준비
+        source = doc.metadata.get("source", "Unknown")
+        section = doc.metadata.get("section", "")
+        block = f"[문서 {i + 1}] 출처: {source}"
+        if section:
+            block += f", 섹션: {section}"
+        return block + f"\n{doc.page_content}\n\n"
+
+    # 프롬프트 메시지 준비 - 역할별 토큰 예산에 맞춰 검색 컨텍스트와 대화 기록을 잘라냄
     def _prepare_messages(self, state: AgentState) -> AgentState:
 
         debate_state = state["debate_state"]
-        context = state["context"]
+
+        # 고정 부분 (시스템 프롬프트 + 컨텍스트/토론 기록을 제외한 지시문) 토큰 수
+        system_message = SystemMessage(content=self.system_prompt)
+        system_tokens = TOKENS_PER_MESSAGE + count_tokens(self.system_prompt)
+        instruction_tokens = TOKENS_PER_MESSAGE + count_tokens(
+            self._create_prompt({**debate_state, "context": "", "debate_record": ""})
+        )
+        context_budget, history_budget = token_budget.allocate(
+            self.role, system_tokens + instruction_tokens
+        )
+
+        # 관련도 순으로 예산 안에 들어가는 문서만 포함 (남은 예산은 대화 기록에 사용)
+        blocks, context_tokens = fit_documents(
+            [self._format_document(i, doc) for i, doc in enumerate(state["documents"])],
+            context_budget,
+        )
+        context = "".join(blocks)
+        history_budget += context_budget - context_tokens
+
+        # 설정된 방식에 따라 대화 기록 선택 (전체 / 최근 N개 / 요약 + 최근 N개) 후 예산 적용
+        summary, history, record = "", [], ""
+        if self.include_history:
+            summary, history = select_history(
+                debate_state, settings.HISTORY_STRATEGY, settings.HISTORY_WINDOW_TURNS
+            )
+            summary, history, history_tokens = fit_history(summary, history, history_budget)
+        else:
+            record, history_tokens = self._fit_debate_record(debate_state, history_budget)
 
         # 시스템 프롬프트로 시작
-        messages = [SystemMessage(content=self.system_prompt)]
+        messages = [system_message]
+        if summary:
+            messages.append(SystemMessage(content=f"지금까지의 토론 요약:\n{summary}"))
 
-        # 기존 대화 기록 추가
-        for message in debate_state["messages"]:
+        # 대화 기록 추가
+        for message in history:
             if message["role"] == "assistant":
                 messages.append(AIMessage(content=message["content"]))
             else:
@@ -116,24 +181,68 @@ class Agent(ABC):
                 )
 
         # 프롬프트 생성 (검색된 컨텍스트 포함)
-        prompt = self._create_prompt({**debate_state, "context": context})
+        prompt = self._create_prompt(
+            {**debate_state, "context": context, "debate_record": record}
+        )
         messages.append(HumanMessage(content=prompt))
 
+        # 구성 요소별 프롬프트 토큰 수
+        breakdown = {
+            "system": system_tokens,
+            "instructions": instruction_tokens,
+            "history": history_tokens,
+            "context": context_tokens,
+        }
+
         # 상태 업데이트
-        return {**state, "messages": messages}
+        return {
+            **state,
+            "context": context,
+            "messages": messages,
+            "usage": {
+                "prompt_tokens": count_message_tokens(messages),
+                "breakdown": breakdown,
+            },
+        }
+
+    # 프롬프트에 직접 포함할 토론 기록 (include_history=False 인 에이전트에서 구현)
+    # 반환: (예산 안에 들어가는 토론 기록, 사용한 토큰 수)
+    def _fit_debate_record(
+        self, debate_state: Dict[str, Any], budget: int
+    ) -> Tuple[str, int]:
+        return "", 0
 
     # 프롬프트 생성 - 하위 클래스에서 구현 필요
     @abstractmethod
     def _create_prompt(self, state: Dict[str, Any]) -> str:
         pass
 
-    # LLM 호출
-    def _generate_response(self, state: AgentState) -> AgentState:
+    # LLM 호출 - 생성되는 토큰을 custom 스트림으로 바로 내보냄
+    async def _generate_response(
+        self, state: AgentState, writer: StreamWriter
+    ) -> AgentState:
 
         messages = state["messages"]
-        response = get_llm().invoke(messages)
-
-        return {**state, "response": response.content}
+        current_round = state["debate_state"]["current_round"]
+
+        response = ""
+        index = 0
+        async for chunk in get_llm().astream(messages):
+            if not chunk.content:
+                continue
+
+            response += chunk.content
+            writer(
+                {
+                    "role": self.role,
+                    "current_round": current_round,
+                    "index": index,
+                    "content": chunk.content,
+                }
+            )
+            index += 1
+
+        return {**state, "response": response}
 
     # 상태 업데이트
     def _update_state(self, state: AgentState) -> AgentState:
@@ -145,27 +254,52 @@ class Agent(ABC):
         new_debate_state = debate_state.copy()
 
         # 에이전트 응답 추가
+        completion_tokens = count_tokens(response)
         new_debate_state["messages"].append(
-            {"role": self.role, "content": response, "current_round": current_round}
+            {
+                "role": self.role,
+                "content": response,
+                "current_round": current_round,
+                "token_count": completion_tokens,
+            }
         )
 
+        # 발언별 토큰 사용량 기록 (스트림 이벤트로도 전달)
+        usage = {
+            "role": self.role,
+            "current_round": current_round,
+            **state["usage"],
+            "completion_tokens": completion_tokens,
+        }
+        new_debate_state.setdefault("token_usage", []).append(usage)
+
+        # 심판이 사용할 토론 기록에 새 발언만 이어 붙임
+        new_debate_state.update(extend_transcript(new_debate_state))
+
         # 이전 노드 정보 업데이트
         new_debate_state["prev_node"] = self.role
 
         # 상태 업데이트
-        return {**state, "debate_state": new_debate_state}
+        return {**state, "debate_state": new_debate_state, "usage": usage}
 
     # 토론 실행
-    def run(self, state: DebateState) -> DebateState:
+    # 에이전트 인스턴스는 요청 간에 공유되므로 요청별 값(session_id)은 config로 전달받음
+    async def run(self, state: DebateState, config: RunnableConfig) -> DebateState:
 
         # 초기 에이전트 상태 구성
         agent_state = AgentState(
-            debate_state=state, context="", messages=[], response=""
+            debate_state=state,
+            documents=[],
+            context="",
+            messages=[],
+            usage={},
+            response="",
         )
 
         # 내부 그래프 실행
-        langfuse_handler = CallbackHandler(session_id=self.session_id)
-        result = self.graph.invoke(
+        session_id = config.get("configurable", {}).get("session_id")
+        langfuse_handler = CallbackHandler(session_id=session_id)
+        result = await self.graph.ainvoke(
             agent_state, config={"callbacks": [langfuse_handler]}
         )
 
@@ -1,21 +1,26 @@
+from utils.tokens import count_tokens
 from workflow.agents.agent import Agent
+from workflow.history import SUMMARY, extend_transcript, format_turn, select_history
 from workflow.state import AgentType
-from typing import Dict, Any
+from workflow.token_budget import fit_transcript
+from typing import Dict, Any, Tuple
 
 
 class JudgeAgent(Agent):
 
-    def __init__(self, k: int = 2, session_id: str = None):
+    # 토론 기록은 프롬프트에 한 번만 포함하고 채팅 기록으로는 다시 전달하지 않음
+    include_history = False
+
+    def __init__(self, k: int = 2):
         super().__init__(
             system_prompt="당신은 공정하고 논리적인 토론 심판입니다. 양측의 주장을 면밀히 검토하고 객관적으로 평가해주세요.",
             role=AgentType.JUDGE,
             k=k,
-            session_id=session_id,
         )
 
     def _create_prompt(self, state: Dict[str, Any]) -> str:
 
-        debate_summary = self._build_debate_summary(state)
+        debate_summary = state.get("debate_record", "")
 
         return f"""
             다음은 '{state['topic']}'에 대한 찬반 토론입니다. 각 측의 주장을 분석하고 평가해주세요.
@@ -35,21 +40,17 @@ class JudgeAgent(Agent):
             최대 500자 이내로 작성해주세요.
             """
 
-    def _build_debate_summary(self, state: Dict[str, Any]) -> str:
-
-        summary = ""
-
-        # 모든 메시지 순회
-        for message in state["messages"]:
-            role = message["role"]
-            content = message["content"]
-
-            # 역할에 따른 표시 이름
-            role_name = (
-                AgentType.to_korean(role) if hasattr(AgentType, "to_korean") else role
-            )
-
-            # 요약에 메시지 추가
-            summary += f"\n\n{role_name}: {content}"
-
-        return summary
+    # 토론 상태에 발언마다 누적된 기록을 그대로 사용 (매번 전체 메시지를 다시 합치지 않음)
+    # 예산을 넘으면 누적 요약 + 최근 발언 순으로 줄여서 사용 (오래된 발언부터 제외)
+    def _fit_debate_record(
+        self, debate_state: Dict[str, Any], budget: int
+    ) -> Tuple[str, int]:
+        transcript = extend_transcript(debate_state)["transcript"]
+        tokens = count_tokens(transcript)
+        if tokens <= budget:
+            return transcript, tokens
+
+        summary, history = select_history(debate_state, SUMMARY, 0)
+        return fit_transcript(
+            summary, [format_turn(message) for message in history], budget
+        )
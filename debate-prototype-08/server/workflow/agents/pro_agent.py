@@ -5,12 +5,11 @@ from typing import Dict, Any
 
 class ProAgent(Agent):
 
-    def __init__(self, k: int = 2, session_id: str = None):
+    def __init__(self, k: int = 2):
         super().__init__(
             system_prompt="당신은 논리적이고 설득력 있는 찬성 측 토론자입니다.",
             role=AgentType.PRO,
             k=k,
-            session_id=session_id,
         )
 
     def _create_prompt(self, state: Dict[str, Any]) -> str:
@@ -1,9 +1,26 @@
+from langchain_core.runnables import RunnableConfig
+from utils.config import settings
+from workflow.history import SUMMARY, update_history_summary
 from workflow.state import DebateState
 
 
 class RoundManager:
-    def run(self, state: DebateState) -> DebateState:
-        return self.increment_round(state)
+    async def run(self, state: DebateState, config: RunnableConfig) -> DebateState:
+        new_state = self.increment_round(state)
+
+        # 요약 방식이면 라운드가 끝날 때마다 최근 발언 창에서 밀려난 발언을 요약에 반영
+        # (마지막 라운드 뒤에는 심판이 전체 기록을 직접 사용하므로 생략)
+        if (
+            settings.HISTORY_STRATEGY == SUMMARY
+            and new_state["current_round"] <= new_state["max_rounds"]
+        ):
+            new_state.update(
+                await update_history_summary(
+                    new_state, settings.HISTORY_WINDOW_TURNS, config
+                )
+            )
+
+        return new_state
 
     def increment_round(self, state: DebateState) -> DebateState:
         new_state = state.copy()
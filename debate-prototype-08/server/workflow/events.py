@@ -0,0 +1,111 @@
+# 토론 스트림(SSE) 이벤트 인코더
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+# 지원하는 스트림 프로토콜 버전
+# - 1: 발언마다 전체 토론 상태를 담은 update 이벤트 전송 (기존 방식)
+# - 2: 새 발언만 담은 message, 역할별 1회 docs, 마지막 summary 이벤트 전송
+FULL_STATE_PROTOCOL = 1
+DELTA_PROTOCOL = 2
+SUPPORTED_PROTOCOL_VERSIONS = (FULL_STATE_PROTOCOL, DELTA_PROTOCOL)
+
+Event = Tuple[str, Dict[str, Any]]
+
+
+def format_event(event_type: str, data: Any) -> str:
+    """SSE 이벤트 문자열 생성"""
+    event_data = {"type": event_type, "data": data}
+    return f"data: {json.dumps(event_data, ensure_ascii=False)}\n\n"
+
+
+def content_hash(messages: List[Dict]) -> str:
+    """메시지 목록의 SHA-256 해시 (클라이언트 재구성 결과 검증용)"""
+    payload = json.dumps(messages, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FullStateEncoder:
+    """프로토콜 v1 - 발언이 끝날 때마다 전체 토론 상태 전송"""
+
+    def encode_update(self, role: str, node: str, update: Dict[str, Any]) -> List[Event]:
+        if node != "update_state":
+            return []
+
+        debate_state = update.get("debate_state", {})
+
+        state = {
+            "role": role,
+            "response": update.get("response", None),
+            "topic": debate_state.get("topic"),
+            "messages": debate_state.get("messages", []),
+            "current_round": debate_state.get("current_round"),
+            "max_rounds": debate_state.get("max_rounds"),
+            "docs": debate_state.get("docs", {}),
+            "usage": update.get("usage"),
+        }
+        return [("update", state)]
+
+    def encode_end(self) -> List[Event]:
+        return []
+
+
+class DeltaEncoder:
+    """프로토콜 v2 - 새로 추가된 내용만 전송"""
+
+    def __init__(self):
+        self.messages: List[Dict] = []
+        self.sent_docs = set()
+        self.topic: Optional[str] = None
+        self.max_rounds: Optional[int] = None
+
+    def encode_update(self, role: str, node: str, update: Dict[str, Any]) -> List[Event]:
+        debate_state = update.get("debate_state", {})
+        self.topic = debate_state.get("topic", self.topic)
+        self.max_rounds = debate_state.get("max_rounds", self.max_rounds)
+
+        # 검색 완료 시 역할별 참고 자료는 한 번만 전송
+        if node == "retrieve_context":
+            docs = debate_state.get("docs", {})
+            if role in docs and role not in self.sent_docs:
+                self.sent_docs.add(role)
+                return [("docs", {"role": role, "docs": docs[role]})]
+            return []
+
+        # 발언 완료 시 새 메시지만 전송
+        # (messages 리스트는 그래프 실행 중 계속 추가되므로 응답 값으로 재구성)
+        if node == "update_state":
+            message = {
+                "role": role,
+                "content": update.get("response", ""),
+                "current_round": debate_state.get("current_round"),
+            }
+            self.messages.append(message)
+            # 토큰 사용량은 표시용으로만 전달 (content_hash 계산 대상 아님)
+            return [
+                (
+                    "message",
+                    {
+                        "seq": len(self.messages) - 1,
+                        **message,
+                        "usage": update.get("usage"),
+                    },
+                )
+            ]
+
+        return []
+
+    def encode_end(self) -> List[Event]:
+        summary = {
+            "topic": self.topic,
+            "max_rounds": self.max_rounds,
+            "message_count": len(self.messages),
+            "content_hash": content_hash(self.messages),
+        }
+        return [("summary", summary)]
+
+
+def create_encoder(protocol_version: int):
+    if protocol_version == DELTA_PROTOCOL:
+        return DeltaEncoder()
+    return FullStateEncoder()
@@ -1,21 +1,22 @@
+from functools import lru_cache
 from workflow.agents.con_agent import ConAgent
 from workflow.agents.judge_agent import JudgeAgent
 from workflow.agents.pro_agent import ProAgent
 from workflow.agents.round_manager import RoundManager
 from workflow.state import DebateState, AgentType
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 
 
-def create_debate_graph(enable_rag: bool = True, session_id: str = ""):
+def create_debate_graph(enable_rag: bool = True, k: int = 2):
 
     # 그래프 생성
     workflow = StateGraph(DebateState)
 
     # 에이전트 인스턴스 생성 - enable_rag에 따라 검색 문서 수 결정
-    k_value = 2 if enable_rag else 0
-    pro_agent = ProAgent(k=k_value, session_id=session_id)
-    con_agent = ConAgent(k=k_value, session_id=session_id)
-    judge_agent = JudgeAgent(k=k_value, session_id=session_id)
+    k_value = k if enable_rag else 0
+    pro_agent = ProAgent(k=k_value)
+    con_agent = ConAgent(k=k_value)
+    judge_agent = JudgeAgent(k=k_value)
     round_manager = RoundManager()
 
     # 노드 추가
@@ -34,13 +35,21 @@ def create_debate_graph(enable_rag: bool = True, session_id: str = ""):
         [AgentType.JUDGE, AgentType.PRO],
     )
 
-    workflow.set_entry_point(AgentType.PRO)
+    workflow.add_edge(START, AgentType.PRO)
+
     workflow.add_edge(AgentType.JUDGE, END)
 
     # 그래프 컴파일
     return workflow.compile()
 
 
+# 컴파일된 그래프를 설정별로 캐시하여 요청마다 재생성하지 않음
+# (요청별 값은 실행 시 config["configurable"]로 전달)
+@lru_cache(maxsize=None)
+def get_debate_graph(enable_rag: bool = True, k: int = 2):
+    return create_debate_graph(enable_rag, k)
+
+
 if __name__ == "__main__":
 
     graph = create_debate_graph(True)
@@ -0,0 +1,93 @@
+# 에이전트에 전달할 대화 기록 선택 - 전체 / 최근 N개 / 누적 요약 + 최근 N개
+from typing import Dict, List, Tuple
+
+from langchain.schema import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
+
+from utils.config import get_llm
+from workflow.state import AgentType, DebateState
+
+FULL = "full"
+WINDOW = "window"
+SUMMARY = "summary"
+
+
+def select_history(
+    state: DebateState, strategy: str, window_turns: int
+) -> Tuple[str, List[Dict]]:
+    """(누적 요약, 원문으로 전달할 발언 목록)"""
+    messages = state["messages"]
+
+    if strategy == WINDOW:
+        return "", messages[-window_turns:] if window_turns > 0 else []
+
+    if strategy == SUMMARY:
+        # 요약에 포함되지 않은 발언만 원문으로 전달
+        return (
+            state.get("history_summary", ""),
+            messages[state.get("summarized_count", 0) :],
+        )
+
+    return "", messages
+
+
+def format_turn(message: Dict) -> str:
+    """토론 기록 문자열의 발언 한 개"""
+    return f"\n\n{AgentType.to_korean(message['role'])}: {message['content']}"
+
+
+def extend_transcript(state: DebateState) -> Dict:
+    """아직 반영되지 않은 발언만 토론 기록 문자열 뒤에 이어 붙임
+
+    발언마다 전체 기록을 다시 만들지 않고, 같은 발언이 두 번 들어가지 않도록
+    반영된 발언 수를 함께 저장
+    """
+    messages = state["messages"]
+    transcript = state.get("transcript", "")
+    start = state.get("transcript_count", 0)
+
+    for message in messages[start:]:
+        transcript += format_turn(message)
+
+    return {"transcript": transcript, "transcript_count": len(messages)}
+
+
+async def update_history_summary(
+    state: DebateState, window_turns: int, config: RunnableConfig
+) -> Dict:
+    """최근 N개를 제외하고 아직 요약되지 않은 발언을 기존 요약에 이어서 반영
+
+    매 라운드 새로 밀려난 발언만 요약하므로 토론이 길어져도 요약 비용이 일정함
+    """
+    messages = state["messages"]
+    start = state.get("summarized_count", 0)
+    end = max(len(messages) - window_turns, start)
+    if end == start:
+        return {}
+
+    transcript = "\n\n".join(
+        f"{AgentType.to_korean(message['role'])}: {message['content']}"
+        for message in messages[start:end]
+    )
+    previous = state.get("history_summary") or "(없음)"
+
+    prompt = f"""토론 주제: '{state['topic']}'
+
+지금까지의 요약:
+{previous}
+
+새로 추가된 발언:
+{transcript}
+
+기존 요약에 새 발언의 핵심 주장과 근거를 반영하여 갱신된 요약을 작성하세요.
+각 측의 입장이 구분되도록 정리하고, 400자 이내로 작성하세요."""
+
+    response = await get_llm().ainvoke(
+        [
+            SystemMessage(content="당신은 토론 내용을 간결하고 정확하게 요약하는 기록자입니다."),
+            HumanMessage(content=prompt),
+        ],
+        config=config,
+    )
+
+    return {"history_summary": response.content, "summarized_count": end}
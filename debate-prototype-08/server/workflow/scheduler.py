@@ -0,0 +1,142 @@
+# 토론 실행 스케줄러 - 동시 실행 수 제한, 대기열, 클라이언트별 할당량
+import asyncio
+from collections import Counter
+from typing import AsyncIterator, Collection, Dict, Hashable, List, Tuple
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 찬 경우"""
+
+
+class QuotaExceededError(Exception):
+    """클라이언트별 동시 토론 할당량을 초과한 경우"""
+
+
+class DebateTicket:
+    def __init__(self, address: str, client_id: Tuple[str, str], group: Hashable):
+        self.address = address  # 접속 주소
+        self.client_id = client_id  # (접속 주소, X-Client-Id) - 클라이언트별 할당량 키
+        self.group = group  # 실행 순서 공정성 기준 (신뢰하지 않는 주소는 주소 단위)
+        self.granted = False  # 실행 허가 여부
+        self.released = False
+        self.changed = asyncio.Event()  # 대기 순번/허가 상태 변경 알림
+
+
+class DebateScheduler:
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        max_per_client: int,
+        max_per_address: int,
+        trusted_addresses: Collection[str] = (),
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_per_client = max_per_client
+        self.max_per_address = max_per_address
+        # 여러 사용자의 요청을 대신 보내는 프런트엔드(Streamlit 서버 등) 주소
+        # - 주소 단위 할당량을 적용하지 않고 X-Client-Id 를 사용자 구분에 사용
+        self.trusted_addresses = set(trusted_addresses)
+
+        self.running = 0
+        self.waiting: List[DebateTicket] = []
+        self.address_tickets: Counter = Counter()  # 주소별 대기 + 실행 중 토론 수
+        self.client_tickets: Counter = Counter()  # 클라이언트별 대기 + 실행 중 토론 수
+        self.client_running: Counter = Counter()  # 공정성 기준별 실행 중 토론 수
+        self.positions: Dict[DebateTicket, int] = {}  # 대기 중인 토론의 실행 순서 (1부터)
+
+    # 토론 실행 요청 등록
+    # 할당량은 서버가 확인한 접속 주소 기준이며, 클라이언트가 정하는 X-Client-Id 는 주소 안의 하위 키로만 사용
+    def submit(self, address: str, client_id: str = "") -> DebateTicket:
+        trusted = address in self.trusted_addresses
+        key = (address, client_id)
+
+        if not trusted and self.address_tickets[address] >= self.max_per_address:
+            raise QuotaExceededError(address)
+        if self.client_tickets[key] >= self.max_per_client:
+            raise QuotaExceededError(address)
+
+        if self.running >= self.max_concurrent and len(self.waiting) >= self.max_queue:
+            raise QueueFullError(address)
+
+        ticket = DebateTicket(address, key, key if trusted else address)
+        self.address_tickets[address] += 1
+        self.client_tickets[key] += 1
+        self.waiting.append(ticket)
+        self._dispatch()
+        return ticket
+
+    # 대기 순번 (1부터 시작) - 도착 순서가 아니라 _dispatch 가 실행을 허가할 순서
+    def position(self, ticket: DebateTicket) -> int:
+        return self.positions[ticket]
+
+    # 실행 허가를 받을 때까지 대기 - poll_interval마다 현재 순번을 반환
+    async def wait(
+        self, ticket: DebateTicket, poll_interval: float
+    ) -> AsyncIterator[int]:
+        while not ticket.granted:
+            ticket.changed.clear()
+            yield self.position(ticket)
+
+            if ticket.granted:
+                break
+            try:
+                await asyncio.wait_for(ticket.changed.wait(), poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    # 토론 종료 또는 대기 취소
+    def release(self, ticket: DebateTicket):
+        if ticket.released:
+            return
+        ticket.released = True
+
+        if ticket.granted:
+            self.running -= 1
+            self.client_running[ticket.group] -= 1
+        else:
+            self.waiting.remove(ticket)
+
+        self.address_tickets[ticket.address] -= 1
+        self.client_tickets[ticket.client_id] -= 1
+        self._dispatch()
+
+    # 빈 자리가 있으면 대기 중인 토론 실행 허가
+    def _dispatch(self):
+        while self.running < self.max_concurrent and self.waiting:
+            # 실행 중인 토론이 가장 적은 클라이언트 우선, 같으면 먼저 들어온 순서
+            ticket = min(self.waiting, key=lambda t: self.client_running[t.group])
+            self.waiting.remove(ticket)
+
+            ticket.granted = True
+            self.running += 1
+            self.client_running[ticket.group] += 1
+            ticket.changed.set()
+
+        self._update_positions()
+
+        # 남은 대기자에게 순번 변경 알림
+        for ticket in self.waiting:
+            ticket.changed.set()
+
+    # 지금 상태에서 자리가 하나씩 날 때 _dispatch 가 고르는 순서를 그대로 계산
+    # (이후 새 요청이 더 적게 실행 중인 클라이언트에서 들어오면 그 요청이 앞에 설 수 있음)
+    def _update_positions(self):
+        running = Counter(self.client_running)
+        remaining = list(self.waiting)
+        self.positions = {}
+        while remaining:
+            ticket = min(remaining, key=lambda t: running[t.group])
+            remaining.remove(ticket)
+            running[ticket.group] += 1
+            self.positions[ticket] = len(self.positions) + 1
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": len(self.waiting),
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+        }
@@ -27,3 +27,8 @@ class DebateState(TypedDict):
     max_rounds: int
     docs: Dict[str, List]  # RAG 검색 결과
     contexts: Dict[str, str]  # RAG 검색 컨텍스트
+    history_summary: str  # 최근 발언 이전 대화의 누적 요약
+    summarized_count: int  # 요약에 반영된 발언 수
+    transcript: str  # 발언마다 이어 붙이는 토론 기록 (심판용)
+    transcript_count: int  # 토론 기록에 반영된 발언 수
+    token_usage: List[Dict]  # 발언별 프롬프트/응답 토큰 수
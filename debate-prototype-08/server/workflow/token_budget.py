@@ -0,0 +1,94 @@
+# 역할별 프롬프트 토큰 예산 - 시스템 프롬프트/지시문을 제외한 나머지를 검색 컨텍스트와 대화 기록에 배분
+from typing import Dict, List, Tuple
+
+from utils.tokens import TOKENS_PER_MESSAGE, count_tokens, truncate_tokens
+
+# 잘라서라도 넣을 만한 최소 문서 길이 (이보다 적게 남으면 문서를 더 넣지 않음)
+MIN_TRUNCATED_TOKENS = 64
+
+
+class TokenBudget:
+
+    def __init__(self, total: int, context_shares: Dict[str, float]):
+        self.total = total  # 프롬프트 전체 토큰 예산
+        self.context_shares = context_shares  # 역할별 남은 예산 중 검색 컨텍스트 비율
+
+    def allocate(self, role: str, fixed_tokens: int) -> Tuple[int, int]:
+        """(검색 컨텍스트 예산, 대화 기록 예산)"""
+        remaining = max(self.total - fixed_tokens, 0)
+        context = int(remaining * self.context_shares.get(role, 0.5))
+        return context, remaining - context
+
+
+def fit_documents(blocks: List[str], budget: int) -> Tuple[List[str], int]:
+    """관련도 순으로 정렬된 문서를 예산 안에서 앞에서부터 채움 (마지막 문서는 잘라서 포함)
+
+    반환: (포함할 문서, 사용한 토큰 수)
+    """
+    fitted = []
+    used = 0
+    for block in blocks:
+        tokens = count_tokens(block)
+        if used + tokens <= budget:
+            fitted.append(block)
+            used += tokens
+            continue
+
+        remaining = budget - used
+        if remaining >= MIN_TRUNCATED_TOKENS:
+            fitted.append(truncate_tokens(block, remaining))
+            used = budget
+        break
+
+    return fitted, used
+
+
+def fit_history(summary: str, history: List[Dict], budget: int) -> Tuple[str, List[Dict], int]:
+    """누적 요약을 우선 포함하고, 최근 발언부터 예산 안에 들어가는 만큼 포함
+
+    반환: (요약, 포함할 발언(시간 순), 사용한 토큰 수)
+    """
+    used = 0
+    if summary:
+        tokens = TOKENS_PER_MESSAGE + count_tokens(summary)
+        if tokens <= budget:
+            used = tokens
+        else:
+            summary = ""
+
+    fitted = []
+    for message in reversed(history):
+        tokens = TOKENS_PER_MESSAGE + count_tokens(message["content"])
+        if used + tokens > budget:
+            break
+        fitted.append(message)
+        used += tokens
+
+    fitted.reverse()
+    return summary, fitted, used
+
+
+def fit_transcript(summary: str, turns: List[str], budget: int) -> Tuple[str, int]:
+    """프롬프트에 직접 넣는 토론 기록 - 누적 요약을 우선 포함하고 최근 발언부터 예산 안에서 채움
+
+    turns 는 시간 순 발언 문자열, 반환: (토론 기록, 사용한 토큰 수)
+    """
+    used = 0
+    if summary:
+        summary = f"(이전 발언 요약)\n{summary}"
+        tokens = count_tokens(summary)
+        if tokens <= budget:
+            used = tokens
+        else:
+            summary = ""
+
+    fitted = []
+    for turn in reversed(turns):
+        tokens = count_tokens(turn)
+        if used + tokens > budget:
+            break
+        fitted.append(turn)
+        used += tokens
+
+    fitted.reverse()
+    return summary + "".join(fitted), used